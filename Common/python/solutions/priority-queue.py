@@ -1,10 +1,17 @@
+import asyncio
 import heapq
+import threading
+import time
+from collections import deque
+from itertools import count
+from queue import Empty, Full
 
 
 # using a min-heap for efficient priority queue implementation
 class PriorityQueue:
     def __init__(self):
         self._heap = []
+        self._counter = count()
 
     def append(self, value, priority):
         """
@@ -12,7 +19,9 @@ class PriorityQueue:
         Lower priority numbers are popped first.
         """
         # heapq is a min-heap; first element is priority
-        heapq.heappush(self._heap, (priority, value))
+        # the counter keeps FIFO order among equal priorities,
+        # so values themselves are never compared
+        heapq.heappush(self._heap, (priority, next(self._counter), value))
 
     def pop(self):
         """
@@ -21,19 +30,254 @@ class PriorityQueue:
         """
         if not self._heap:
             raise IndexError("pop from an empty priority queue")
-        priority, value = heapq.heappop(self._heap)
+        priority, _, value = heapq.heappop(self._heap)
         return value
 
 
 # Example usage:
-pq = PriorityQueue()
-pq.append("low", 5)
-pq.append("medium", 3)
-pq.append("high", 1)
+if __name__ == "__main__":
+    pq = PriorityQueue()
+    pq.append("low", 5)
+    pq.append("medium", 3)
+    pq.append("high", 1)
 
-print(pq.pop())  # "high"
-print(pq.pop())  # "medium"
-print(pq.pop())  # "low"
+    print(pq.pop())  # "high"
+    print(pq.pop())  # "medium"
+    print(pq.pop())  # "low"
+
+
+# thread-safe and asyncio-aware version of the heap-based PriorityQueue above
+# - threads block in get()/put(), coroutines await get_async()/put_async()
+# - the lock is held only for a heap push/pop (O(log n)), never while waiting;
+#   batch get_many()/put_many() move many items per lock acquisition
+# - coroutines never block the event loop on the lock: they poll it
+# - maxsize > 0 bounds the queue: producers wait for room (backpressure)
+class ConcurrentPriorityQueue(PriorityQueue):
+    def __init__(self, maxsize=0):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        # (loop, future) of coroutines waiting for an item / for room
+        self._async_getters = deque()
+        self._async_putters = deque()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _full(self):
+        return 0 < self.maxsize <= len(self._heap)
+
+    @staticmethod
+    def _wake(waiters, n=1):
+        "Waking up to n waiting coroutines (called with the lock held)"
+        while waiters and n > 0:
+            loop, future = waiters.popleft()
+            loop.call_soon_threadsafe(_set_waiter_done, future)
+            n -= 1
+
+    def _put_locked(self, value, priority):
+        heapq.heappush(self._heap, (priority, next(self._counter), value))
+        self._not_empty.notify()
+        self._wake(self._async_getters)
+
+    def _get_locked(self, n=1):
+        values = [heapq.heappop(self._heap)[2] for _ in range(min(n, len(self._heap)))]
+        self._not_full.notify(len(values))
+        self._wake(self._async_putters, len(values))
+        return values
+
+    @staticmethod
+    def _deadline(timeout):
+        return None if timeout is None else time.monotonic() + timeout
+
+    @staticmethod
+    def _remaining(deadline):
+        return None if deadline is None else deadline - time.monotonic()
+
+    # ------------- threads -------------
+    def put(self, value, priority, block=True, timeout=None):
+        """
+        Add an item with a given priority, waiting for room if the queue is full.
+        Raises queue.Full if no room is available (in time, or at once if not block).
+        """
+        with self._not_full:
+            if self._full():
+                if not block:
+                    raise Full
+                if not self._not_full.wait_for(lambda: not self._full(), timeout):
+                    raise Full
+            self._put_locked(value, priority)
+
+    def put_many(self, items, timeout=None):
+        """
+        Add many (value, priority) items, as many per lock acquisition as fit.
+        Raises queue.Full if room is not available in time.
+        """
+        items = list(items)
+        deadline = self._deadline(timeout)
+        i = 0
+        while i < len(items):
+            with self._not_full:
+                ready = self._not_full.wait_for(
+                    lambda: not self._full(), self._remaining(deadline)
+                )
+                if not ready:
+                    raise Full
+                room = self.maxsize - len(self._heap) if self.maxsize > 0 else len(items)
+                for value, priority in items[i : i + room]:
+                    self._put_locked(value, priority)
+                i += room
+
+    def get(self, block=True, timeout=None):
+        """
+        Remove and return the item with the highest priority, waiting for one.
+        Raises queue.Empty if no item is available (in time, or at once if not block).
+        """
+        return self.get_many(1, block, timeout)[0]
+
+    def get_many(self, n, block=True, timeout=None):
+        """
+        Remove and return up to n items in priority order with one lock
+        acquisition; waits only until at least one item is available.
+        Raises queue.Empty if no item is available in time.
+        """
+        with self._not_empty:
+            if not self._heap:
+                if not block:
+                    raise Empty
+                if not self._not_empty.wait_for(lambda: self._heap, timeout):
+                    raise Empty
+            return self._get_locked(n)
+
+    def append(self, value, priority):
+        "Same as put(): waits for room if the queue is bounded and full"
+        self.put(value, priority)
+
+    def pop(self):
+        """
+        Remove and return the item with the highest priority without waiting.
+        Raises IndexError if the queue is empty.
+        """
+        try:
+            return self.get(block=False)
+        except Empty:
+            raise IndexError("pop from an empty priority queue") from None
+
+    # ------------- asyncio -------------
+    async def _acquire_async(self):
+        """
+        Take the lock without blocking the event loop: a thread may hold it,
+        so it is polled (with a growing delay) instead of waited for
+        """
+        delay = 0
+        while not self._lock.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(2 * delay or 1e-6, 1e-3)
+
+    def _leave(self, loop, waiters, future, ready):
+        """
+        A coroutine leaving without taking an item (or room): dropping its
+        waiter, or passing on the wake-up it got; while the lock is busy it is
+        retried on the next iteration of the loop instead of blocking it
+        """
+        if not self._lock.acquire(blocking=False):
+            loop.call_soon(self._leave, loop, waiters, future, ready)
+            return
+        try:
+            if (loop, future) in waiters:
+                waiters.remove((loop, future))
+            elif ready():
+                self._wake(waiters)
+        finally:
+            self._lock.release()
+
+    async def _wait_async(self, waiters, ready, timeout):
+        """
+        Wait (without blocking the event loop) until ready() is True and
+        return with the lock held; the caller must release it
+        """
+        loop = asyncio.get_running_loop()
+        deadline = self._deadline(timeout)
+        future = None
+        while True:
+            try:
+                await self._acquire_async()
+            except BaseException:
+                if future is not None:
+                    # we were woken up but are leaving: pass the wake-up on
+                    self._leave(loop, waiters, future, ready)
+                raise
+            if ready():
+                return
+            future = loop.create_future()
+            waiters.append((loop, future))
+            self._lock.release()
+            try:
+                await asyncio.wait_for(future, self._remaining(deadline))
+            except BaseException:
+                self._leave(loop, waiters, future, ready)
+                raise
+
+    async def put_async(self, value, priority, timeout=None):
+        """
+        Add an item with a given priority, awaiting room if the queue is full.
+        Raises TimeoutError if room is not available in time.
+        """
+        await self._wait_async(self._async_putters, lambda: not self._full(), timeout)
+        try:
+            self._put_locked(value, priority)
+        finally:
+            self._lock.release()
+
+    async def get_async(self, timeout=None):
+        """
+        Remove and return the item with the highest priority, awaiting one.
+        Raises TimeoutError if no item is available in time.
+        """
+        return (await self.get_many_async(1, timeout))[0]
+
+    async def get_many_async(self, n, timeout=None):
+        """
+        Remove and return up to n items in priority order, awaiting at least one.
+        Raises TimeoutError if no item is available in time.
+        """
+        await self._wait_async(self._async_getters, lambda: self._heap, timeout)
+        try:
+            return self._get_locked(n)
+        finally:
+            self._lock.release()
+
+
+def _set_waiter_done(future):
+    if not future.done():
+        future.set_result(None)
+
+
+# Example usage: producer threads and an event loop share one bounded queue
+if __name__ == "__main__":
+
+    def producer(q, name, jobs):
+        for i in range(jobs):
+            q.put(f"{name}-{i}", priority=i % 3)  # waits while the queue is full
+
+    async def consumer(q, total):
+        done = []
+        while len(done) < total:
+            done += await q.get_many_async(10)
+        return done
+
+    cq = ConcurrentPriorityQueue(maxsize=100)
+    threads = [
+        threading.Thread(target=producer, args=(cq, f"p{i}", 1000)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    jobs = asyncio.run(consumer(cq, 4000))
+    for thread in threads:
+        thread.join()
+    print(len(jobs), len(cq))  # 4000 0
 
 
 # using a simple list for priority queue implementation
@@ -69,11 +313,137 @@ class PriorityQueue:
 
 
 # Example usage
-pq = PriorityQueue()
-pq.append("low", 5)
-pq.append("medium", 3)
-pq.append("high", 1)
-
-print(pq.pop())  # high
-print(pq.pop())  # medium
-print(pq.pop())  # low
+if __name__ == "__main__":
+    pq = PriorityQueue()
+    pq.append("low", 5)
+    pq.append("medium", 3)
+    pq.append("high", 1)
+
+    print(pq.pop())  # high
+    print(pq.pop())  # medium
+    print(pq.pop())  # low
+
+
+# using an indexed min-heap: every item gets a handle and the heap position of
+# each handle is tracked, so items can be re-prioritised or removed in O(log n)
+class IndexedPriorityQueue:
+    def __init__(self):
+        self._heap = []  # [priority, sequence, handle, value] entries
+        self._position = {}  # handle -> index of its entry in the heap
+        self._counter = count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, handle):
+        return handle in self._position
+
+    def _before(self, i, j):
+        "True if entry i must be popped before entry j"
+        a, b = self._heap[i], self._heap[j]
+        # FIFO among equal priorities; values are never compared
+        return (a[0], a[1]) < (b[0], b[1])
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._position[heap[i][2]] = i
+        self._position[heap[j][2]] = j
+
+    def _sift_up(self, i):
+        while i > 0:
+            parent = (i - 1) // 2
+            if not self._before(i, parent):
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        n = len(self._heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and self._before(child + 1, child):
+                child += 1
+            if not self._before(child, i):
+                break
+            self._swap(i, child)
+            i = child
+
+    def append(self, value, priority):
+        """
+        Add an item with a given priority and return its handle.
+        Lower priority numbers are popped first; equal ones in FIFO order.
+        """
+        sequence = next(self._counter)
+        handle = sequence  # unique for the lifetime of the queue
+        self._position[handle] = len(self._heap)
+        self._heap.append([priority, sequence, handle, value])
+        self._sift_up(len(self._heap) - 1)
+        return handle
+
+    def peek(self):
+        """
+        Return the item with the highest priority without removing it: O(1).
+        Raises IndexError if the queue is empty.
+        """
+        if not self._heap:
+            raise IndexError("peek from an empty priority queue")
+        return self._heap[0][3]
+
+    def _remove_at(self, i):
+        "Remove the entry at heap index i and return it"
+        last = len(self._heap) - 1
+        if i != last:
+            self._swap(i, last)
+        entry = self._heap.pop()
+        del self._position[entry[2]]
+        if i < len(self._heap):
+            # the moved entry may belong either above or below
+            self._sift_up(i)
+            self._sift_down(i)
+        return entry
+
+    def pop(self):
+        """
+        Remove and return the item with the highest priority.
+        Raises IndexError if the queue is empty.
+        """
+        if not self._heap:
+            raise IndexError("pop from an empty priority queue")
+        return self._remove_at(0)[3]
+
+    def remove(self, handle):
+        """
+        Remove the item of the given handle and return its value: O(log n).
+        Raises KeyError if the handle is not in the queue.
+        """
+        return self._remove_at(self._position[handle])[3]
+
+    def update_priority(self, handle, priority):
+        """
+        Change the priority of the item of the given handle: O(log n).
+        Among equal priorities it keeps its original insertion (FIFO) order.
+        Raises KeyError if the handle is not in the queue.
+        """
+        i = self._position[handle]
+        self._heap[i][0] = priority
+        self._sift_up(i)
+        self._sift_down(self._position[handle])
+
+
+# Example usage
+if __name__ == "__main__":
+    pq = IndexedPriorityQueue()
+    backup = pq.append("backup", 5)
+    report = pq.append("report", 3)
+    pq.append("deploy", 3)
+    pq.append({"job": "cleanup"}, 3)  # equal priorities never compare values
+
+    pq.update_priority(backup, 1)
+    pq.remove(report)
+    print(pq.peek())  # backup
+    print(pq.pop())  # backup
+    print(pq.pop())  # deploy
+    print(pq.pop())  # {'job': 'cleanup'}
@@ -0,0 +1,228 @@
+# Multiprocess work queue over shared memory (built on RingBuffer of circular_queue.py)
+# ProcessPoolExecutor pickles every task and result and sends them through a
+# pipe, which dominates the cost of small CPU-bound tasks. Here tasks and results
+# are fixed-size struct records in two ring buffers in shared memory:
+# - the tasks ring: filled by the dispatcher (the only producer); workers
+#   (many consumers) take turns with a lock to claim a whole batch at once
+# - the results ring: workers (many producers) take turns with a lock to append
+#   a whole batch; the dispatcher is the only consumer
+# Locks are taken once per batch, not per task, and the function is sent to
+# the workers only once, when they start.
+import importlib.util
+import multiprocessing
+import os
+import struct
+import time
+
+# loading the ring buffer of DS&A/Data-Structures/circular_queue.py
+_path = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "..",
+    "..",
+    "DS&A",
+    "Data-Structures",
+    "circular_queue.py",
+)
+_spec = importlib.util.spec_from_file_location("circular_queue", _path)
+circular_queue = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(circular_queue)
+RingBuffer = circular_queue.RingBuffer
+
+
+def _worker(
+    function, task_format, result_format, tasks_name, results_name, locks, stop, batch
+):
+    "Worker process: claiming batches of tasks and appending their results"
+    task_record = struct.Struct(task_format)
+    result_record = struct.Struct(result_format)
+    tasks = RingBuffer.attach(tasks_name)
+    results = RingBuffer.attach(results_name)
+    claim_lock, result_lock = locks
+    claimed = bytearray(batch * task_record.size)
+    out = bytearray(batch * result_record.size)
+    delay = 0
+    try:
+        # stop is only set by close(): tasks left then belong to a failed map
+        while not stop.is_set():
+            with claim_lock:
+                count, _ = tasks.dequeue_many(batch, claimed)
+            if not count:
+                time.sleep(delay)  # polling with a growing delay while idle
+                delay = min(2 * delay or 1e-6, 1e-3)
+                continue
+            delay = 0
+            with memoryview(claimed)[: count * task_record.size] as view:
+                for i, (task_id, *args) in enumerate(task_record.iter_unpack(view)):
+                    result = function(*args)
+                    if not isinstance(result, tuple):
+                        result = (result,)
+                    offset = i * result_record.size
+                    result_record.pack_into(out, offset, task_id, *result)
+            with result_lock, memoryview(out)[: count * result_record.size] as view:
+                # nobody may be collecting results (after a failed map): waiting
+                # for room a bit at a time, so that stop is seen
+                stored = 0
+                while stored < count and not stop.is_set():
+                    rest = view[stored * result_record.size :]
+                    stored += results.enqueue_many(rest, timeout=0.01)
+                    rest.release()
+    finally:
+        tasks.close()
+        results.close()
+
+
+class SharedWorkQueue:
+    """
+    Pool of worker processes calling function(*task) for fixed-size tasks.
+    task_format/result_format are struct formats (without a byte order prefix),
+    e.g. "qd" for function(int, float) -> a float: "d".
+    A map which fails (a worker died, or it was interrupted) leaves its tasks
+    and results in the rings, so the queue can't be used any more after it
+    """
+
+    def __init__(
+        self,
+        function,
+        task_format,
+        result_format,
+        workers=None,
+        capacity=4096,
+        batch=64,
+    ):
+        self.task_record = struct.Struct("<Q" + task_format)  # task id first
+        self.result_record = struct.Struct("<Q" + result_format)
+        self.batch = batch
+        self.tasks = RingBuffer.create_shared(capacity, self.task_record.size)
+        self.results = RingBuffer.create_shared(capacity, self.result_record.size)
+        self._stop = multiprocessing.Event()
+        locks = (multiprocessing.Lock(), multiprocessing.Lock())
+        args = (
+            function,
+            self.task_record.format,
+            self.result_record.format,
+            self.tasks.shm.name,
+            self.results.shm.name,
+            locks,
+            self._stop,
+            batch,
+        )
+        self._workers = [
+            multiprocessing.Process(target=_worker, args=args, daemon=True)
+            for _ in range(workers or os.cpu_count())
+        ]
+        for p in self._workers:
+            p.start()
+        self._next_id = 0
+        self._broken = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def map(self, tasks):
+        """
+        Returns the results of all tasks (tuples of arguments) in order;
+        tasks are enqueued as room frees up while results are being collected
+        """
+        if self._broken:
+            raise RuntimeError("an earlier map failed: the queue is broken")
+        tasks = list(tasks)
+        try:
+            return self._map(tasks)
+        except BaseException:
+            # stale tasks and results of this map would end up in the next one
+            self._broken = True
+            raise
+
+    def _map(self, tasks):
+        n = len(tasks)
+        base = self._next_id
+        self._next_id += n
+        results = [None] * n
+        task_size, result_size = self.task_record.size, self.result_record.size
+        pending = bytearray(self.batch * task_size)
+        out = bytearray(self.tasks.k * result_size)
+        sent = received = packed = 0
+        delay = 0
+        while received < n:
+            stored = 0
+            if sent < n:
+                # packing the next batch and enqueuing what fits without waiting
+                if packed == 0:
+                    packed = min(self.batch, n - sent)
+                    for i in range(packed):
+                        task_id = base + sent + i
+                        self.task_record.pack_into(
+                            pending, i * task_size, task_id, *tasks[sent + i]
+                        )
+                view = memoryview(pending)[: packed * task_size]
+                stored = self.tasks.enqueue_many(view, timeout=0)
+                view.release()
+                if stored < packed:
+                    # keeping the rest of the batch for the next round
+                    rest = pending[stored * task_size : packed * task_size]
+                    pending[: len(rest)] = rest
+                sent += stored
+                packed -= stored
+            count, _ = self.results.dequeue_many(self.tasks.k, out)
+            view = memoryview(out)[: count * result_size]
+            for task_id, *result in self.result_record.iter_unpack(view):
+                result = result[0] if len(result) == 1 else tuple(result)
+                results[task_id - base] = result
+            view.release()
+            received += count
+            if stored or count:
+                delay = 0
+            else:
+                if not all(p.is_alive() for p in self._workers):
+                    raise RuntimeError("a worker process died (did it raise?)")
+                time.sleep(delay)  # waiting for the workers with a growing delay
+                delay = min(2 * delay or 1e-6, 1e-3)
+        return results
+
+    def close(self):
+        "Stopping the workers and freeing the shared memory"
+        self._stop.set()
+        for p in self._workers:
+            p.join(1)
+            if p.is_alive():
+                # still running a task of a failed map
+                p.terminate()
+                p.join()
+        for ring in (self.tasks, self.results):
+            ring.close()
+            ring.shm.unlink()
+
+
+def collatz_steps(n):
+    "A small CPU-bound task: number of Collatz steps from n down to 1"
+    steps = 0
+    while n != 1:
+        n = 3 * n + 1 if n & 1 else n >> 1
+        steps += 1
+    return steps
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = 50_000
+    with SharedWorkQueue(collatz_steps, "q", "q", workers=4) as wq:
+        print(wq.map([(n,) for n in range(1, 11)]))  # [0, 1, 7, 2, 5, 8, 16, 3, 19, 6]
+        t = time.perf_counter()
+        ours = wq.map([(i,) for i in range(1, n + 1)])
+        print(f"shared work queue:              {time.perf_counter() - t:.2f}s")
+
+    # one task per call (like run_in_executor) and batches of 64 tasks per pickle
+    with ProcessPoolExecutor(4) as executor:
+        for chunksize in (1, 64):
+            t = time.perf_counter()
+            theirs = list(
+                executor.map(collatz_steps, range(1, n + 1), chunksize=chunksize)
+            )
+            seconds = time.perf_counter() - t
+            print(f"ProcessPoolExecutor (chunk {chunksize:>2}): {seconds:.2f}s")
+            assert ours == theirs
@@ -0,0 +1,90 @@
+# Tests of shared-work-queue.py: results, failing tasks and the broken state
+# usage: python shared-work-queue_test.py (or pytest)
+import importlib.util
+import os
+import threading
+import time
+import unittest
+
+# loading the work queue of shared-work-queue.py (its name isn't importable)
+_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "shared-work-queue.py")
+_spec = importlib.util.spec_from_file_location("shared_work_queue", _path)
+shared_work_queue = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(shared_work_queue)
+SharedWorkQueue = shared_work_queue.SharedWorkQueue
+
+TIMEOUT = 30  # seconds before a hanging call counts as a failure
+
+
+def square(x):
+    return x * x
+
+
+def fail_at_100(x):
+    time.sleep(0.001)  # slow enough that the other worker is busy when map fails
+    if x == 100:
+        raise ValueError("task 100 failed")
+    return x
+
+
+def run_with_timeout(function):
+    "Calling function in a thread; returns its exception (None), fails if it hangs"
+    outcome = []
+
+    def target():
+        try:
+            function()
+            outcome.append(None)
+        except BaseException as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(TIMEOUT)
+    if thread.is_alive():
+        raise AssertionError(f"{function.__name__} hangs")
+    return outcome[0]
+
+
+class SharedWorkQueueTest(unittest.TestCase):
+    def test_results_in_order(self):
+        with SharedWorkQueue(square, "q", "q", workers=2, capacity=64, batch=8) as wq:
+            # more tasks than the rings hold, in several maps
+            self.assertEqual(
+                wq.map([(x,) for x in range(1000)]), [x * x for x in range(1000)]
+            )
+            self.assertEqual(wq.map([(3,)]), [9])
+            self.assertEqual(wq.map([]), [])
+
+    def test_several_result_fields(self):
+        def divmod_map():
+            with SharedWorkQueue(divmod, "qq", "qq", workers=2) as wq:
+                self.assertEqual(wq.map([(7, 2), (9, 3)]), [(3, 1), (3, 0)])
+
+        self.assertIsNone(run_with_timeout(divmod_map))
+
+    def test_failing_task_then_close_returns(self):
+        # the surviving worker's batch and the tasks left in the ring don't fit
+        # in the results ring, which nobody reads any more
+        def failing_map():
+            with SharedWorkQueue(
+                fail_at_100, "q", "q", workers=2, capacity=16, batch=16
+            ) as wq:
+                wq.map([(x,) for x in range(1000)])
+
+        error = run_with_timeout(failing_map)
+        self.assertIsInstance(error, RuntimeError)
+
+    def test_queue_is_broken_after_a_failed_map(self):
+        wq = SharedWorkQueue(fail_at_100, "q", "q", workers=2, capacity=16, batch=16)
+        try:
+            with self.assertRaises(RuntimeError):
+                wq.map([(x,) for x in range(1000)])
+            with self.assertRaisesRegex(RuntimeError, "broken"):
+                wq.map([(1,)])
+        finally:
+            self.assertIsNone(run_with_timeout(wq.close))
+
+
+if __name__ == "__main__":
+    unittest.main()
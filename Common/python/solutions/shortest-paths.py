@@ -0,0 +1,400 @@
+import importlib.util
+import math
+import os
+import random
+import time
+
+# loading the priority queues of priority-queue.py (its name isn't importable)
+_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "priority-queue.py")
+_spec = importlib.util.spec_from_file_location("priority_queue", _path)
+priority_queue = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(priority_queue)
+
+
+# Weighted shortest paths (non-negative weights)
+# - Dijkstra: vertices are settled in order of distance from the source; every
+#   vertex is in the heap once and a shorter path found later lowers its
+#   priority in place (decrease-key of IndexedPriorityQueue), so the heap never
+#   holds more than V entries: O((V + E) log V)
+# - A*: the priority is distance + an estimate of the rest (heuristic); with an
+#   estimate that never overshoots (and is consistent) the result is still the
+#   shortest path, but far fewer vertices are settled on the way to the target
+# - bidirectional: one search from the source and one backwards from the target
+#   meet in the middle; two balls of radius d/2 instead of one of radius d
+# - within: a search which stops at a given radius (a neighbourhood query)
+# Graphs are dicts of dicts ({u: {v: weight}}) or objects with edges(v) which
+# returns the targets and weights arrays (like CSRGraph of DS&A/Data-Structures)
+class SearchStats:
+    "What a query cost: settled vertices and heap operations"
+
+    __slots__ = ("settled", "pushes", "pops", "decreases", "seconds")
+
+    def __init__(self):
+        self.settled = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decreases = 0
+        self.seconds = 0.0
+
+    @property
+    def heap_ops(self):
+        return self.pushes + self.pops + self.decreases
+
+    def __repr__(self):
+        return (
+            f"SearchStats(settled={self.settled}, heap_ops={self.heap_ops}, "
+            f"ms={self.seconds * 1000:.2f})"
+        )
+
+
+class Route:
+    "Result of a source -> target query; distance is inf and path empty if unreachable"
+
+    __slots__ = ("distance", "path", "stats")
+
+    def __init__(self, distance, path, stats):
+        self.distance = distance
+        self.path = path
+        self.stats = stats
+
+    def __repr__(self):
+        return f"Route(distance={self.distance}, path={self.path})"
+
+
+class ShortestPathTree:
+    "Result of a one-to-all query: distances and parents of the reached vertices"
+
+    __slots__ = ("source", "distances", "parents", "stats")
+
+    def __init__(self, source, distances, parents, stats):
+        self.source = source
+        self.distances = distances
+        self.parents = parents
+        self.stats = stats
+
+    def path_to(self, v):
+        "Returns the path from the source to v (empty if v wasn't reached)"
+        return _path_to(self.parents, v) if v in self.distances else []
+
+
+def _path_to(parents, v):
+    "Following the parents back from v to the source"
+    path = [v]
+    while parents[v] is not None:
+        v = parents[v]
+        path.append(v)
+    path.reverse()
+    return path
+
+
+def _dict_edges(G):
+    def edges(v):
+        return G[v].items() if v in G else ()
+
+    return edges
+
+
+def _array_edges(graph):
+    def edges(v):
+        targets, weights = graph.edges(v)
+        targets = targets.tolist()
+        weights = weights.tolist() if weights is not None else [1.0] * len(targets)
+        return zip(targets, weights)
+
+    return edges
+
+
+class ShortestPaths:
+    def __init__(self, graph, directed=True):
+        """
+        Shortest path queries over a weighted graph; directed only matters for
+        dict graphs (a CSR graph knows it) and makes backward searches build
+        the reversed graph once, on first use
+        """
+        self.graph = graph
+        if isinstance(graph, dict):
+            self._forward = _dict_edges(graph)
+            self.directed = directed
+        else:
+            self._forward = _array_edges(graph)
+            self.directed = graph.directed
+        self._reversed = None
+
+    def _backward(self):
+        "Returns the edges function of the reversed graph (the graph if undirected)"
+        if not self.directed:
+            return self._forward
+        if self._reversed is None:
+            if isinstance(self.graph, dict):
+                vertices = self.graph
+            else:
+                vertices = range(len(self.graph))
+            R = {}
+            for u in vertices:
+                for v, w in self._forward(u):
+                    # of parallel edges (a CSR graph may have them) the lightest counts
+                    reversed_edges = R.setdefault(v, {})
+                    reversed_edges[u] = min(w, reversed_edges.get(u, math.inf))
+            self._reversed = _dict_edges(R)
+        return self._reversed
+
+    @staticmethod
+    def _relax(pq, handles, distances, parents, stats, u, v, d, priority):
+        "Reaching v from u with distance d: pushing it, or lowering its priority"
+        if v not in distances:
+            distances[v] = d
+            parents[v] = u
+            handles[v] = pq.append(v, priority)
+            stats.pushes += 1
+        elif d < distances[v] and v in handles:
+            distances[v] = d
+            parents[v] = u
+            pq.update_priority(handles[v], priority)
+            stats.decreases += 1
+
+    def _search(self, source, target=None, radius=math.inf, heuristic=None, edges=None):
+        """
+        Dijkstra (A* with a heuristic) from the source until the target is
+        settled or the next vertex is farther than radius; over the reversed
+        graph when given its edges. Returns (distances, parents, settled, stats)
+        """
+        stats = SearchStats()
+        started = time.perf_counter()
+        edges = edges or self._forward
+        estimate = (lambda v: heuristic(v, target)) if heuristic else (lambda v: 0)
+        distances = {source: 0}
+        parents = {source: None}
+        settled = set()
+        pq = priority_queue.IndexedPriorityQueue()
+        handles = {source: pq.append(source, estimate(source))}
+        stats.pushes += 1
+        while len(pq):
+            u = pq.pop()
+            del handles[u]
+            stats.pops += 1
+            d = distances[u]
+            if d > radius:
+                # distances beyond the radius aren't part of the result
+                del distances[u], parents[u]
+                for v in handles:
+                    del distances[v], parents[v]
+                break
+            settled.add(u)
+            stats.settled += 1
+            if u == target:
+                break
+            for v, w in edges(u):
+                if w < 0:
+                    raise ValueError(f"negative edge weight {u} -> {v}")
+                if v not in settled:
+                    nd = d + w
+                    priority = nd + estimate(v)
+                    self._relax(
+                        pq, handles, distances, parents, stats, u, v, nd, priority
+                    )
+        stats.seconds = time.perf_counter() - started
+        return distances, parents, settled, stats
+
+    def _route(self, source, target, heuristic=None):
+        search = self._search(source, target, heuristic=heuristic)
+        distances, parents, settled, stats = search
+        if target not in settled:
+            return Route(math.inf, [], stats)
+        return Route(distances[target], _path_to(parents, target), stats)
+
+    def dijkstra(self, source, target):
+        "Returns the shortest Route from source to target; stops when it's settled"
+        return self._route(source, target)
+
+    def astar(self, source, target, heuristic):
+        """
+        Returns the shortest Route from source to target using A*;
+        heuristic(v, target) estimates the distance from v to the target and
+        must never overshoot it (e.g. euclidean or landmarks)
+        """
+        return self._route(source, target, heuristic)
+
+    def within(self, source, radius=math.inf):
+        """
+        Returns the ShortestPathTree of all vertices at distance <= radius from
+        the source (all reachable vertices by default)
+        """
+        distances, parents, _, stats = self._search(source, radius=radius)
+        return ShortestPathTree(source, distances, parents, stats)
+
+    def bidirectional(self, source, target):
+        """
+        Returns the shortest Route from source to target with two Dijkstra
+        searches (forwards from the source, backwards from the target),
+        expanding the smaller frontier each step; it stops when the two
+        frontiers' distances add up to more than the best path found so far
+        """
+        stats = SearchStats()
+        started = time.perf_counter()
+        sides = []
+        for s, edges in ((source, self._forward), (target, self._backward())):
+            pq = priority_queue.IndexedPriorityQueue()
+            sides.append(
+                {
+                    "edges": edges,
+                    "pq": pq,
+                    "handles": {s: pq.append(s, 0)},
+                    "distances": {s: 0},
+                    "parents": {s: None},
+                    "settled": set(),
+                }
+            )
+        stats.pushes += 2
+        best, meeting = (0, source) if source == target else (math.inf, None)
+        forward, backward = sides
+        while len(forward["pq"]) and len(backward["pq"]):
+            top = forward["distances"][forward["pq"].peek()]
+            top += backward["distances"][backward["pq"].peek()]
+            if top >= best:
+                break
+            if len(forward["pq"]) <= len(backward["pq"]):
+                side, other = forward, backward
+            else:
+                side, other = backward, forward
+            pq, handles = side["pq"], side["handles"]
+            distances, parents = side["distances"], side["parents"]
+            u = pq.pop()
+            del handles[u]
+            stats.pops += 1
+            side["settled"].add(u)
+            stats.settled += 1
+            d = distances[u]
+            for v, w in side["edges"](u):
+                if w < 0:
+                    raise ValueError(f"negative edge weight between {u} and {v}")
+                if v in side["settled"]:
+                    continue
+                nd = d + w
+                self._relax(pq, handles, distances, parents, stats, u, v, nd, nd)
+                # a path through the edge (u, v) joining the other search
+                if v in other["distances"] and nd + other["distances"][v] < best:
+                    best, meeting = nd + other["distances"][v], v
+        stats.seconds = time.perf_counter() - started
+        if meeting is None:
+            return Route(math.inf, [], stats)
+        path = _path_to(forward["parents"], meeting)
+        path.extend(reversed(_path_to(backward["parents"], meeting)[:-1]))
+        return Route(best, path, stats)
+
+    def landmarks(self, landmarks):
+        """
+        Returns an A* heuristic from distances to/from a few landmark vertices
+        (ALT): by the triangle inequality d(v, t) >= d(L, t) - d(L, v) and
+        d(v, t) >= d(v, L) - d(t, L). Landmarks at the edge of the graph work best
+        """
+        forward = [self.within(L).distances for L in landmarks]
+        if self.directed:
+            edges = self._backward()
+            backward = [self._search(L, edges=edges)[0] for L in landmarks]
+        else:
+            backward = forward
+
+        def heuristic(v, t):
+            h = 0
+            for to_l, from_l in zip(forward, backward):
+                if v in to_l and t in to_l:
+                    h = max(h, to_l[t] - to_l[v])
+                if v in from_l and t in from_l:
+                    h = max(h, from_l[v] - from_l[t])
+            return h
+
+        return heuristic
+
+
+def euclidean(coordinates, scale=1.0):
+    """
+    Returns an A* heuristic of straight-line distances between vertex
+    coordinates ({v: (x, y)}); scale is the lowest weight per unit of length
+    """
+
+    def heuristic(v, t):
+        (x1, y1), (x2, y2) = coordinates[v], coordinates[t]
+        return math.hypot(x1 - x2, y1 - y2) * scale
+
+    return heuristic
+
+
+def manhattan(coordinates, scale=1.0):
+    "Returns an A* heuristic of grid (|dx| + |dy|) distances, for 4-connected grids"
+
+    def heuristic(v, t):
+        (x1, y1), (x2, y2) = coordinates[v], coordinates[t]
+        return (abs(x1 - x2) + abs(y1 - y2)) * scale
+
+    return heuristic
+
+
+def grid_graph(width, height, seed=0):
+    """
+    Returns a 4-connected grid road map {v: {u: w}} with weights in [1, 2)
+    and the coordinates of its vertices
+    """
+    rng = random.Random(seed)
+    G = {}
+    coordinates = {}
+    for y in range(height):
+        for x in range(width):
+            v = y * width + x
+            coordinates[v] = (x, y)
+            G.setdefault(v, {})
+            right = v + 1 if x + 1 < width else None
+            down = v + width if y + 1 < height else None
+            for u in (right, down):
+                if u is not None:
+                    w = 1 + rng.random()
+                    G[v][u] = w
+                    G.setdefault(u, {})[v] = w
+    return G, coordinates
+
+
+# Example usage
+if __name__ == "__main__":
+    G = {
+        "A": {"B": 4, "C": 1},
+        "B": {"D": 1},
+        "C": {"B": 2, "D": 5},
+        "D": {"E": 3},
+        "E": {},
+    }
+    paths = ShortestPaths(G)
+    # Route(distance=7, path=['A', 'C', 'B', 'D', 'E'])
+    print(paths.dijkstra("A", "E"))
+    # Route(distance=7, path=['A', 'C', 'B', 'D', 'E'])
+    print(paths.bidirectional("A", "E"))
+    print(paths.dijkstra("E", "A"))  # Route(distance=inf, path=[])
+    print(paths.within("A", radius=3).distances)  # {'A': 0, 'B': 3, 'C': 1}
+
+    # a directed CSR graph (requires numpy) with parallel edges 2 -> 3:
+    # the backward search must use the lighter one too
+    _path = os.path.join(os.path.dirname(_path), "../../../DS&A/Data-Structures")
+    _path = os.path.join(_path, "graph_csr.py")
+    _spec = importlib.util.spec_from_file_location("graph_csr", _path)
+    graph_csr = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(graph_csr)
+    edges = [0, 2, 2], [2, 3, 3], [6.0, 1.0, 6.0]
+    C = graph_csr.CSRGraph.from_edges(4, *edges, directed=True)
+    paths = ShortestPaths(C)
+    print(paths.dijkstra(0, 3))  # Route(distance=7.0, path=[0, 2, 3])
+    print(paths.bidirectional(0, 3).distance)  # 7.0
+    print(paths.astar(0, 3, paths.landmarks([3])).distance)  # 7.0
+
+    # routing on a 300x300 grid road map: all methods find the same distance,
+    # but settle very different numbers of vertices
+    G, coordinates = grid_graph(300, 300)
+    paths = ShortestPaths(G, directed=False)
+    source, target = 0, 299 * 300 + 150
+    heuristic = paths.landmarks([0, 299, 299 * 300, 300 * 300 - 1])
+    queries = {
+        "dijkstra": lambda: paths.dijkstra(source, target),
+        "bidirectional": lambda: paths.bidirectional(source, target),
+        "A* (manhattan)": lambda: paths.astar(source, target, manhattan(coordinates)),
+        "A* (landmarks)": lambda: paths.astar(source, target, heuristic),
+    }
+    for name, query in queries.items():
+        route = query()
+        print(f"{name:<15} {route.distance:8.2f} {route.stats}")
@@ -0,0 +1,189 @@
+import asyncio
+import importlib.util
+import math
+import os
+import time
+from itertools import count
+
+# loading the priority queues of priority-queue.py (its name isn't importable)
+_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "priority-queue.py")
+_spec = importlib.util.spec_from_file_location("priority_queue", _path)
+priority_queue = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(priority_queue)
+
+
+# Hierarchical timing wheel: a deadline queue for huge numbers of timers
+# - time is split into ticks; level 0 has one slot per tick for the current
+#   block of 2^bits ticks, level k has one slot per 2^(bits*k) ticks
+# - a timer is put in the lowest level whose block contains both now and its
+#   deadline, so append/cancel are O(1) (a dict insert/delete in one slot)
+# - when time enters a new block of level k, the timers of that block's slot
+#   are moved ("cascaded") down to lower levels
+# - deadlines beyond the last level wait in a heap (IndexedPriorityQueue)
+class TimerWheel:
+    def __init__(self, tick=0.001, now=0.0, bits=8, levels=4):
+        """
+        Creating a timer wheel with the given tick (resolution) starting at now;
+        with the defaults it covers 2^32 ticks (~50 days of 1ms ticks)
+        before falling back to the heap
+        """
+        self.tick = tick
+        self.origin = now
+        self.bits = bits
+        self.levels = levels
+        self._mask = (1 << bits) - 1
+        self._slots = [[{} for _ in range(1 << bits)] for _ in range(levels)]
+        self._counts = [0] * levels  # number of timers on each level
+        self._overflow = priority_queue.IndexedPriorityQueue()
+        self._where = {}  # handle -> (level, slot) or (None, overflow handle)
+        self._handles = count()
+        self._current = 0  # next tick to be processed
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, handle):
+        return handle in self._where
+
+    def _to_tick(self, t):
+        # rounding up, so a timer never expires before its deadline
+        return math.ceil((t - self.origin) / self.tick - 1e-9)
+
+    def _place(self, handle, deadline, value):
+        "Putting a timer in the lowest level whose block contains now and its deadline"
+        deadline = max(deadline, self._current)
+        # the highest differing bit of deadline and now tells the level
+        level = max((deadline ^ self._current).bit_length() - 1, 0) // self.bits
+        if level >= self.levels:
+            overflow_handle = self._overflow.append((deadline, handle, value), deadline)
+            self._where[handle] = (None, overflow_handle)
+            return
+        slot = self._slots[level][(deadline >> (self.bits * level)) & self._mask]
+        slot[handle] = (deadline, value)
+        self._where[handle] = (level, slot)
+        self._counts[level] += 1
+
+    def append(self, value, deadline):
+        """
+        Schedule a value to expire at the given time (in the clock of now) and
+        return its handle: O(1). Past deadlines expire on the next tick.
+        """
+        handle = next(self._handles)
+        self._place(handle, self._to_tick(deadline), value)
+        return handle
+
+    def cancel(self, handle):
+        """
+        Cancel a scheduled timer: O(1) (O(log n) for far-future ones in the heap).
+        Returns False if it has already expired or been cancelled.
+        """
+        location = self._where.pop(handle, None)
+        if location is None:
+            return False
+        level, slot = location
+        if level is None:
+            self._overflow.remove(slot)
+        else:
+            del slot[handle]
+            self._counts[level] -= 1
+        return True
+
+    def _cascade(self, c):
+        "Moving the timers of the blocks which start at tick c down the levels"
+        for level in range(self.levels, 0, -1):
+            shift = self.bits * level
+            if c & ((1 << shift) - 1):
+                continue
+            if level == self.levels:
+                # deadlines of the new top-level block leave the heap
+                end = ((c >> shift) + 1) << shift
+                while len(self._overflow) and self._overflow.peek()[0] < end:
+                    deadline, handle, value = self._overflow.pop()
+                    self._place(handle, deadline, value)
+                continue
+            slot = self._slots[level][(c >> shift) & self._mask]
+            if slot:
+                timers = list(slot.items())
+                slot.clear()
+                self._counts[level] -= len(timers)
+                for handle, (deadline, value) in timers:
+                    self._place(handle, deadline, value)
+
+    def pop_expired(self, now):
+        """
+        Advance the wheel to the given time, then remove and return the values
+        of all expired timers in deadline order (FIFO for equal deadlines)
+        """
+        target = math.floor((now - self.origin) / self.tick + 1e-9)
+        expired = []
+        while self._current <= target:
+            c = self._current
+            self._cascade(c)
+            slot = self._slots[0][c & self._mask]
+            if slot:
+                # handles grow with time of append: sorting them keeps FIFO order
+                # among equal deadlines (cascaded timers arrive in the slot later)
+                for handle, (_, value) in sorted(slot.items()):
+                    expired.append(value)
+                    del self._where[handle]
+                self._counts[0] -= len(slot)
+                slot.clear()
+            # skipping ticks up to the next block of the lowest non-empty level
+            level = 0
+            while level < self.levels and not self._counts[level]:
+                level += 1
+            if level == self.levels and not len(self._overflow):
+                self._current = target + 1
+                break
+            shift = self.bits * level
+            self._current = min(((c >> shift) + 1) << shift, target + 1)
+        return expired
+
+    async def run(self, on_expire, clock=time.monotonic):
+        "Asyncio driver: calling on_expire(value) for every expired timer each tick"
+        while True:
+            for value in self.pop_expired(clock()):
+                on_expire(value)
+            await asyncio.sleep(self.tick)
+
+
+if __name__ == "__main__":
+    wheel = TimerWheel(tick=1, now=0)
+    a = wheel.append("a", 5)
+    wheel.append("b", 300)  # level 1
+    wheel.append("c", 70_000)  # level 2
+    wheel.append("far", 2**40)  # beyond the wheel: kept in the heap
+    wheel.cancel(a)
+    print(wheel.pop_expired(299), len(wheel))  # [] 3
+    print(wheel.pop_expired(100_000))  # ['b', 'c']
+    print(wheel.pop_expired(2**40))  # ['far']
+
+    # scheduling and cancelling lots of timeouts vs a heap
+    n = 200_000
+    t = time.perf_counter()
+    wheel = TimerWheel(tick=0.001)
+    handles = [wheel.append(i, (i % 60_000) / 1000) for i in range(n)]
+    for h in handles[::2]:
+        wheel.cancel(h)
+    expired = wheel.pop_expired(60)
+    print(f"timer wheel: {len(expired)} expired in {time.perf_counter() - t:.2f}s")
+    t = time.perf_counter()
+    pq = priority_queue.IndexedPriorityQueue()
+    handles = [pq.append(i, (i % 60_000) / 1000) for i in range(n)]
+    for h in handles[::2]:
+        pq.remove(h)
+    expired = [pq.pop() for _ in range(len(pq))]
+    print(f"heap:        {len(expired)} expired in {time.perf_counter() - t:.2f}s")
+
+    # asyncio driver
+    async def main():
+        wheel = TimerWheel(tick=0.01, now=time.monotonic())
+        done = []
+        driver = asyncio.create_task(wheel.run(done.append))
+        for i, delay in enumerate([0.05, 0.02, 0.03]):
+            wheel.append(f"timeout-{i}", time.monotonic() + delay)
+        await asyncio.sleep(0.1)
+        driver.cancel()
+        return done
+
+    print(asyncio.run(main()))  # ['timeout-1', 'timeout-2', 'timeout-0']
@@ -0,0 +1,376 @@
+# B-Tree (disk based, memory-mapped)
+# A B-Tree of minimum degree t is a balanced search tree where:
+# - every node except the root has t-1 to 2t-1 sorted keys
+# - an internal node with k keys has k+1 children
+# - all leaves are at the same level => height is O(log_t n)
+# Each node fills one fixed-size page of a file; pages are accessed through
+# mmap, so opening an index is instant and only the pages a query touches are
+# read from disk (with 4KB pages t = 128: ~4 pages for billions of keys).
+import mmap
+import os
+import struct
+from bisect import bisect_left
+
+# magic, page size, root page, used pages, free pages list head, number of keys
+HEADER = struct.Struct("<8sI4xQQQQ")
+MAGIC = b"BTREE001"
+# leaf flag, number of keys; then keys (int64) and children page numbers (uint64)
+NODE = struct.Struct("<B3xI")
+
+
+class Page:
+    "In-memory copy of a B-Tree node which is stored in a page of the file"
+
+    __slots__ = ("no", "leaf", "keys", "children")
+
+    def __init__(self, no, leaf, keys=None, children=None):
+        self.no = no
+        self.leaf = leaf
+        self.keys = keys if keys is not None else []
+        self.children = children if children is not None else []
+
+
+class DiskBTree:
+    """
+    Persistent B-Tree of 64-bit signed integer keys (e.g. timestamps) with the
+    same operations as BinarySearchTree: insert/search/delete/min/max.
+    The root is kept in the file header, so methods don't take a root;
+    keys are unique (inserting an existing key does nothing).
+    Page 0 is the header and page numbers are used as child pointers
+    """
+
+    def __init__(self, path, page_size=4096):
+        self.path = path
+        self._file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        if os.path.getsize(path) >= HEADER.size:
+            magic, page_size, self._root, self._pages, self._free, self._count = (
+                HEADER.unpack(self._file.read(HEADER.size))
+            )
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a B-Tree file")
+            self._set_page_size(page_size)
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+        else:
+            self._set_page_size(page_size)
+            self._pages = 1
+            self._free = 0
+            self._count = 0
+            self._mm = None
+            self._grow(2)
+            self._root = self._new_page(leaf=True).no
+            self._write_header()
+
+    def _set_page_size(self, page_size):
+        self.page_size = page_size
+        # a node needs room for its header, 2t-1 keys and 2t children
+        self.t = ((page_size - NODE.size - 8) // 16 + 1) // 2
+        if self.t < 2:
+            raise ValueError("page size is too small")
+        self.max_keys = 2 * self.t - 1
+        self._children_offset = NODE.size + 8 * self.max_keys
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        "Returns the number of keys in the tree"
+        return self._count
+
+    def flush(self):
+        "Writing the changed pages back to the file"
+        self._write_header()
+        self._mm.flush()
+
+    def close(self):
+        "Flushing and closing the file"
+        if self._mm is not None:
+            self.flush()
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    # ------------- Pages -------------
+    def _write_header(self):
+        HEADER.pack_into(
+            self._mm,
+            0,
+            MAGIC,
+            self.page_size,
+            self._root,
+            self._pages,
+            self._free,
+            self._count,
+        )
+
+    def _grow(self, pages):
+        "Growing the file (at least doubling it) so that it has room for the given pages"
+        capacity = len(self._mm) // self.page_size if self._mm is not None else 0
+        if pages <= capacity:
+            return
+        if self._mm is not None:
+            self._mm.close()
+        self._file.truncate(max(pages, 2 * capacity) * self.page_size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+
+    def _new_page(self, leaf):
+        "Allocating a page (reusing a freed one if any) for a new empty node"
+        if self._free:
+            no = self._free
+            (self._free,) = struct.unpack_from("<Q", self._mm, no * self.page_size)
+        else:
+            no = self._pages
+            self._pages += 1
+            self._grow(self._pages)
+        page = Page(no, leaf)
+        self._write(page)
+        return page
+
+    def _free_page(self, page):
+        "Adding the page to the free pages list (chained through their first 8 bytes)"
+        struct.pack_into("<Q", self._mm, page.no * self.page_size, self._free)
+        self._free = page.no
+
+    def _read(self, no):
+        offset = no * self.page_size
+        leaf, n = NODE.unpack_from(self._mm, offset)
+        keys = list(struct.unpack_from(f"<{n}q", self._mm, offset + NODE.size))
+        children = []
+        if not leaf:
+            children = list(
+                struct.unpack_from(f"<{n + 1}Q", self._mm, offset + self._children_offset)
+            )
+        return Page(no, bool(leaf), keys, children)
+
+    def _write(self, page):
+        offset = page.no * self.page_size
+        n = len(page.keys)
+        NODE.pack_into(self._mm, offset, page.leaf, n)
+        struct.pack_into(f"<{n}q", self._mm, offset + NODE.size, *page.keys)
+        if not page.leaf:
+            children_format = f"<{len(page.children)}Q"
+            offset += self._children_offset
+            struct.pack_into(children_format, self._mm, offset, *page.children)
+
+    # ------------- Operations -------------
+    def search(self, key):
+        "Returns True if the key exists; only one page per level is read"
+        no = self._root
+        while True:
+            page = self._read(no)
+            i = bisect_left(page.keys, key)
+            if i < len(page.keys) and page.keys[i] == key:
+                return True
+            if page.leaf:
+                return False
+            no = page.children[i]
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def _split_child(self, parent, i, child):
+        """
+        Splitting the full child (2t-1 keys) of the parent into two nodes of t-1 keys;
+        the middle key moves up into the parent. Returns the new right node
+        """
+        t = self.t
+        right = self._new_page(child.leaf)
+        right.keys = child.keys[t:]
+        if not child.leaf:
+            right.children = child.children[t:]
+            child.children = child.children[:t]
+        parent.keys.insert(i, child.keys[t - 1])
+        parent.children.insert(i + 1, right.no)
+        child.keys = child.keys[: t - 1]
+        self._write(child)
+        self._write(right)
+        self._write(parent)
+        return right
+
+    def insert(self, key):
+        """
+        Inserting a new key in a single pass from the root down to a leaf;
+        full nodes on the way are split before entering them, so there is
+        always room for a key moving up. Returns False if the key already exists
+        """
+        x = self._read(self._root)
+        if len(x.keys) == self.max_keys:
+            # the tree only grows in height by splitting the root
+            root = self._new_page(leaf=False)
+            root.children = [x.no]
+            self._split_child(root, 0, x)
+            self._root = root.no
+            x = root
+        while True:
+            i = bisect_left(x.keys, key)
+            if i < len(x.keys) and x.keys[i] == key:
+                break
+            if x.leaf:
+                x.keys.insert(i, key)
+                self._write(x)
+                self._count += 1
+                self._write_header()
+                return True
+            child = self._read(x.children[i])
+            if len(child.keys) == self.max_keys:
+                right = self._split_child(x, i, child)
+                if key == x.keys[i]:
+                    break
+                if key > x.keys[i]:
+                    child = right
+            x = child
+        self._write_header()
+        return False
+
+    def _merge(self, parent, i, left, right):
+        """
+        Merging the right child into the left one (both have t-1 keys)
+        with their separator key from the parent in the middle
+        """
+        left.keys.append(parent.keys.pop(i))
+        left.keys.extend(right.keys)
+        left.children.extend(right.children)
+        parent.children.pop(i + 1)
+        self._write(left)
+        self._free_page(right)
+        if parent.no == self._root and not parent.keys:
+            # the tree only shrinks in height when the root becomes empty
+            self._root = left.no
+            self._free_page(parent)
+        else:
+            self._write(parent)
+        return left
+
+    def _fill(self, parent, i, child):
+        """
+        Making sure the child has at least t keys before entering it;
+        a key is borrowed from a sibling through the parent (rotation),
+        or the child is merged with a sibling. Returns the node to enter
+        """
+        if i > 0:
+            left = self._read(parent.children[i - 1])
+            if len(left.keys) >= self.t:
+                child.keys.insert(0, parent.keys[i - 1])
+                parent.keys[i - 1] = left.keys.pop()
+                if not child.leaf:
+                    child.children.insert(0, left.children.pop())
+                self._write(left)
+                self._write(child)
+                self._write(parent)
+                return child
+        if i < len(parent.keys):
+            right = self._read(parent.children[i + 1])
+            if len(right.keys) >= self.t:
+                child.keys.append(parent.keys[i])
+                parent.keys[i] = right.keys.pop(0)
+                if not child.leaf:
+                    child.children.append(right.children.pop(0))
+                self._write(right)
+                self._write(child)
+                self._write(parent)
+                return child
+            return self._merge(parent, i, child, right)
+        return self._merge(parent, i - 1, left, child)
+
+    def delete(self, key):
+        """
+        Deleting the key in a single pass from the root down;
+        every node entered has at least t keys, so removing a key never
+        leaves a node under-full. A key of an internal node is replaced by its
+        predecessor (or successor) which is then deleted from the sub-tree.
+        Returns False if the key doesn't exist
+        """
+        x = self._read(self._root)
+        while True:
+            i = bisect_left(x.keys, key)
+            if i < len(x.keys) and x.keys[i] == key:
+                if x.leaf:
+                    del x.keys[i]
+                    self._write(x)
+                    self._count -= 1
+                    self._write_header()
+                    return True
+                left = self._read(x.children[i])
+                if len(left.keys) >= self.t:
+                    key = x.keys[i] = self._max_key(left)
+                    self._write(x)
+                    x = left
+                    continue
+                right = self._read(x.children[i + 1])
+                if len(right.keys) >= self.t:
+                    key = x.keys[i] = self._min_key(right)
+                    self._write(x)
+                    x = right
+                    continue
+                x = self._merge(x, i, left, right)
+                continue
+            if x.leaf:
+                self._write_header()
+                return False
+            child = self._read(x.children[i])
+            if len(child.keys) < self.t:
+                child = self._fill(x, i, child)
+            x = child
+
+    def _min_key(self, page):
+        while not page.leaf:
+            page = self._read(page.children[0])
+        return page.keys[0]
+
+    def _max_key(self, page):
+        while not page.leaf:
+            page = self._read(page.children[-1])
+        return page.keys[-1]
+
+    def min_value(self):
+        "Returns the minimum key (None if the tree is empty)"
+        return self._min_key(self._read(self._root)) if self._count else None
+
+    def max_value(self):
+        "Returns the maximum key (None if the tree is empty)"
+        return self._max_key(self._read(self._root)) if self._count else None
+
+    def inorder(self):
+        "Lazily yielding all keys in ascending order"
+        s = [(self._read(self._root), 0)]
+        while s:
+            page, i = s.pop()
+            if page.leaf:
+                yield from page.keys
+                continue
+            # state i: key i-1 is reported, then child i is visited
+            if i > 0:
+                yield page.keys[i - 1]
+            if i < len(page.keys):
+                s.append((page, i + 1))
+            s.append((self._read(page.children[i]), 0))
+
+    def height(self):
+        "Returns the number of levels of the tree"
+        h = 1
+        page = self._read(self._root)
+        while not page.leaf:
+            page = self._read(page.children[0])
+            h += 1
+        return h
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "index.btree")
+    with DiskBTree(path, page_size=64) as tree:  # tiny pages: t = 2
+        for k in [10, 20, 5, 6, 12, 30, 7, 17]:
+            tree.insert(k)
+        print(list(tree.inorder()))  # [5, 6, 7, 10, 12, 17, 20, 30]
+        print(tree.height())  # 2
+        tree.delete(6)
+        tree.delete(20)
+
+    # reopening the file: nothing is rebuilt, pages are read on demand
+    with DiskBTree(path) as tree:
+        print(len(tree), tree.min_value(), tree.max_value())  # 6 5 30
+        print(tree.search(12), 20 in tree)  # True False
+        print(list(tree.inorder()))  # [5, 7, 10, 12, 17, 30]
@@ -1,10 +1,16 @@
 # Binary Search Tree
 # inorder traversing of the BST will returns an ordered list of its nodes!
+import heapq
+from array import array
+from itertools import pairwise
 
 
 class Node:
     "Nodes are the data elements which trees consist of them"
 
+    # fixed attributes instead of a per-node __dict__ (a lot less memory per node)
+    __slots__ = ("key", "left", "right")
+
     def __init__(self, key, left=None, right=None):
         """creating a node with the given data which currently has no connection
         in left or right"""
@@ -13,10 +19,65 @@ class Node:
         self.right = right
 
 
+def _sorted_list(keys):
+    "Returns the keys as a list, raising ValueError if they are not in ascending order"
+    keys = list(keys)
+    if any(a > b for a, b in pairwise(keys)):
+        raise ValueError("keys must be in ascending order")
+    return keys
+
+
 class BinarySearchTree:
+    node_class = Node
+
     def __init__(self):
         self.x = []
 
+    def _update(self, node):
+        "Plain BST nodes have no augmented fields (e.g. height) to recompute"
+
+    def inorder_stack(self, root):
+        "Lazily yielding keys of the BST in ascending (inorder) order"
+        c = root
+        s = []
+        while s or c is not None:
+            if c is not None:
+                s.append(c)
+                c = c.left
+            else:
+                c = s.pop()
+                yield c.key
+                c = c.right
+
+    def from_sorted(self, keys):
+        """
+        Building a perfectly balanced BST from ascending keys in O(n)
+        and returning its root (instead of n inserts: O(n log n) or even O(n^2))
+        """
+        keys = _sorted_list(keys)
+        return self._build(iter(keys), len(keys))
+
+    def _build(self, keys, n):
+        """Building a balanced sub-tree from the next n keys of the ascending
+        iterator; the middle key becomes the root (recursion depth is log n)"""
+        if n == 0:
+            return None
+        left_size = (n - 1) // 2
+        left = self._build(keys, left_size)
+        node = self.node_class(next(keys))
+        node.left = left
+        node.right = self._build(keys, n - 1 - left_size)
+        self._update(node)
+        return node
+
+    def merge(self, root_a, root_b):
+        """
+        Merging two BSTs into a new balanced one in O(n + m) and returning its root
+        Both inorder streams are already sorted, so they are merged like in merge sort
+        """
+        merged = heapq.merge(self.inorder_stack(root_a), self.inorder_stack(root_b))
+        return self.from_sorted(merged)
+
     def inorder(self, root):
         "Traversing binary tree using inorder method knowing the root node"
         if root:
@@ -37,7 +98,7 @@ class BinarySearchTree:
     def insert(self, root, key):
         "Inserting a new key in BST"
         if root is None:
-            return Node(key)
+            return self.node_class(key)
         if key > root.key:
             root.right = self.insert(root.right, key)
         else:
@@ -86,38 +147,472 @@ class BinarySearchTree:
         return c
 
 
-#        4
-#    2       6
-#  1   3   5   7
-# r = Node(4)
-r = None
-bst = BinarySearchTree()
-r = bst.insert(r, 4)
-r = bst.insert(r, 2)
-r = bst.insert(r, 3)
-r = bst.insert(r, 6)
-r = bst.insert(r, 5)
-r = bst.insert(r, 7)
-r = bst.insert(r, 1)
-
-# r = Node(4)
-# r.left = Node(2)
-# r.right = Node(6)
-# r.left.left = Node(1)
-# r.left.right = Node (3)
-# r.right.left = Node(5)
-# r.right.right = Node(7)
-
-
-print(bst.inorder(r))
-r = bst.insert(r, 8)
-print(bst.inorder(r))
-print(bst.min_value_node(r).key)
-print(bst.max_value_node(r).key)
-try:
-    print(bst.search(r, 9).key)
-except AttributeError:
-    print("This key doesn't exist in BST")
-
-r = bst.delete(r, 4)
-print(bst.inorder(r))
+class AVLNode(Node):
+    "BST node which also keeps the height of its own sub-tree"
+
+    __slots__ = ("height",)
+
+    def __init__(self, key, left=None, right=None):
+        super().__init__(key, left, right)
+        self.height = 1
+
+
+class AVLTree(BinarySearchTree):
+    """
+    Self-balancing BST (AVL) with the same API as BinarySearchTree
+    Heights of the left and right sub-trees of every node differ by at most 1,
+    so search/insert/delete stay O(log n) even for sorted keys;
+    all of them are iterative, so there is no recursion limit to hit
+    """
+
+    node_class = AVLNode
+
+    def height(self, node):
+        "Returns the height of the given sub-tree (0 for an empty one)"
+        return node.height if node is not None else 0
+
+    def balance_factor(self, node):
+        "Returns height(left) - height(right) of the given node"
+        return self.height(node.left) - self.height(node.right)
+
+    def _update(self, node):
+        "Recomputing the node's augmented fields (height) from its children"
+        node.height = 1 + max(self.height(node.left), self.height(node.right))
+
+    def rotate_right(self, y):
+        """
+        Rotating the sub-tree to the right and returning its new root
+              y            x
+            x   c   =>   a   y
+          a   b            b   c
+        """
+        x = y.left
+        y.left = x.right
+        x.right = y
+        self._update(y)
+        self._update(x)
+        return x
+
+    def rotate_left(self, x):
+        """
+        Rotating the sub-tree to the left and returning its new root
+            x                y
+          a   y     =>     x   c
+            b   c        a   b
+        """
+        y = x.right
+        x.right = y.left
+        y.left = x
+        self._update(x)
+        self._update(y)
+        return y
+
+    def rebalance(self, node):
+        "Restoring the AVL property of the given node and returning its sub-tree root"
+        self._update(node)
+        balance = self.balance_factor(node)
+        if balance > 1:
+            # left-right case is turned into left-left case first
+            if self.balance_factor(node.left) < 0:
+                node.left = self.rotate_left(node.left)
+            return self.rotate_right(node)
+        if balance < -1:
+            # right-left case is turned into right-right case first
+            if self.balance_factor(node.right) > 0:
+                node.right = self.rotate_right(node.right)
+            return self.rotate_left(node)
+        return node
+
+    def _retrace(self, path):
+        """Rebalancing the visited nodes from the bottom of the path up to the
+        root, re-linking every rotated sub-tree to its parent"""
+        root = None
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            balanced = self.rebalance(node)
+            if balanced is node and node.height == old_height:
+                # nothing changed from here, so the ancestors are still balanced
+                return path[0]
+            if i == 0:
+                root = balanced
+            elif path[i - 1].left is node:
+                path[i - 1].left = balanced
+            else:
+                path[i - 1].right = balanced
+        return root
+
+    def search(self, root, key):
+        "Searching AVL tree for desired key starting from its root (iterative)"
+        c = root
+        while c is not None and c.key != key:
+            c = c.right if key > c.key else c.left
+        return c
+
+    def insert(self, root, key):
+        "Inserting a new key in AVL tree and returning the (possibly new) root"
+        if root is None:
+            return self.node_class(key)
+        path = []
+        c = root
+        while c is not None:
+            path.append(c)
+            c = c.right if key > c.key else c.left
+        parent = path[-1]
+        if key > parent.key:
+            parent.right = self.node_class(key)
+        else:
+            parent.left = self.node_class(key)
+        return self._retrace(path)
+
+    def delete(self, root, key):
+        """
+        Deleting desired key from AVL tree and returning the (possibly new) root
+        Like BinarySearchTree.delete, a node with two children is replaced by
+        the out-most right node of its left sub-tree;
+        the tree is returned unchanged if the key doesn't exist
+        """
+        path = []
+        c = root
+        while c is not None and c.key != key:
+            path.append(c)
+            c = c.right if key > c.key else c.left
+        if c is None:
+            return root
+        if c.left is not None and c.right is not None:
+            # swapping with the predecessor, which has no right child
+            target = c
+            path.append(c)
+            c = c.left
+            while c.right is not None:
+                path.append(c)
+                c = c.right
+            target.key = c.key
+        child = c.left if c.left is not None else c.right
+        if not path:
+            return child
+        parent = path[-1]
+        if parent.left is c:
+            parent.left = child
+        else:
+            parent.right = child
+        return self._retrace(path)
+
+
+class OrderStatisticNode(AVLNode):
+    "AVL node which also keeps the number of nodes in its own sub-tree"
+
+    __slots__ = ("size",)
+
+    def __init__(self, key, left=None, right=None):
+        super().__init__(key, left, right)
+        self.size = 1
+
+
+class OrderStatisticTree(AVLTree):
+    """
+    AVL tree augmented with sub-tree sizes (order-statistics tree)
+    Besides the BST operations it answers rank/select/range queries
+    in O(log n) (+ k for the number of reported keys)
+    """
+
+    node_class = OrderStatisticNode
+
+    def size(self, node):
+        "Returns the number of nodes in the given sub-tree (0 for an empty one)"
+        return node.size if node is not None else 0
+
+    def _update(self, node):
+        "Recomputing the node's augmented fields (height & size) from its children"
+        super()._update(node)
+        node.size = 1 + self.size(node.left) + self.size(node.right)
+
+    def _retrace(self, path):
+        # sizes change all along the path even where heights don't,
+        # so they are fixed (bottom-up) before the rebalancing may stop early
+        for node in reversed(path):
+            node.size = 1 + self.size(node.left) + self.size(node.right)
+        return super()._retrace(path)
+
+    def _count_before(self, root, key, inclusive):
+        "Counting keys smaller than (or equal to, if inclusive) the given key"
+        count = 0
+        c = root
+        while c is not None:
+            if c.key < key or (inclusive and c.key == key):
+                count += self.size(c.left) + 1
+                c = c.right
+            else:
+                c = c.left
+        return count
+
+    def rank(self, root, key):
+        "Returns the number of keys smaller than the given key"
+        return self._count_before(root, key, inclusive=False)
+
+    def select(self, root, k):
+        """
+        Returns the node holding the k-th smallest key (k starts from 0)
+        Raises IndexError if k is out of range
+        """
+        if k < 0 or k >= self.size(root):
+            raise IndexError("select index out of range")
+        c = root
+        while True:
+            left_size = self.size(c.left)
+            if k < left_size:
+                c = c.left
+            elif k == left_size:
+                return c
+            else:
+                k -= left_size + 1
+                c = c.right
+
+    def count_range(self, root, lo, hi):
+        "Returns the number of keys in the closed range [lo, hi]"
+        if lo > hi:
+            return 0
+        return self._count_before(root, hi, inclusive=True) - self.rank(root, lo)
+
+    def range(self, root, lo, hi):
+        """
+        Lazily yielding keys of the closed range [lo, hi] in ascending order
+        Sub-trees entirely out of the range are never visited
+        """
+        s = []
+        c = root
+        while s or c is not None:
+            if c is not None:
+                if c.key < lo:
+                    # c and its left sub-tree are all before the range
+                    c = c.right
+                else:
+                    s.append(c)
+                    c = c.left
+            else:
+                c = s.pop()
+                if c.key > hi:
+                    return
+                yield c.key
+                c = c.right
+
+
+class ArrayBinarySearchTree:
+    """
+    BST with the same operations as BinarySearchTree but stored as
+    struct-of-arrays: keys, left and right child indices live in three typed
+    arrays (a node is just an index, -1 means no child) instead of one Python
+    object per node, which costs a few bytes per node instead of ~100.
+    Keys must fit the array typecode ("q": 64-bit signed integers by default);
+    operations are iterative and return node indices (None when there is no node)
+    """
+
+    def __init__(self, typecode="q"):
+        self.keys = array(typecode)
+        self.left = array("q")
+        self.right = array("q")
+        self._free = -1  # head of the deleted slots list (chained through left)
+
+    def _new_node(self, key):
+        "Storing a new node (reusing a deleted slot if any) and returning its index"
+        if self._free != -1:
+            i = self._free
+            self._free = self.left[i]
+            self.keys[i] = key
+            self.left[i] = -1
+            self.right[i] = -1
+            return i
+        self.keys.append(key)
+        self.left.append(-1)
+        self.right.append(-1)
+        return len(self.keys) - 1
+
+    def _free_node(self, i):
+        self.left[i] = self._free
+        self.right[i] = -1
+        self._free = i
+
+    def key(self, i):
+        "Returns the key stored in the given node"
+        return self.keys[i]
+
+    def from_sorted(self, keys):
+        "Building a perfectly balanced BST from ascending keys in O(n) and returning its root"
+        keys = _sorted_list(keys)
+        root = self._build(iter(keys), len(keys))
+        return None if root == -1 else root
+
+    def _build(self, keys, n):
+        if n == 0:
+            return -1
+        left_size = (n - 1) // 2
+        left = self._build(keys, left_size)
+        node = self._new_node(next(keys))
+        self.left[node] = left
+        self.right[node] = self._build(keys, n - 1 - left_size)
+        return node
+
+    def merge(self, root_a, root_b):
+        "Merging two BSTs of this storage into a new balanced one in O(n + m)"
+        return self.from_sorted(heapq.merge(self.inorder(root_a), self.inorder(root_b)))
+
+    def inorder(self, root):
+        "Lazily yielding keys of the BST in ascending (inorder) order"
+        keys, left, right = self.keys, self.left, self.right
+        c = -1 if root is None else root
+        s = []
+        while s or c != -1:
+            if c != -1:
+                s.append(c)
+                c = left[c]
+            else:
+                c = s.pop()
+                yield keys[c]
+                c = right[c]
+
+    def search(self, root, key):
+        "Searching BST for desired key starting from its root"
+        keys, left, right = self.keys, self.left, self.right
+        c = -1 if root is None else root
+        while c != -1 and keys[c] != key:
+            c = right[c] if key > keys[c] else left[c]
+        return None if c == -1 else c
+
+    def insert(self, root, key):
+        "Inserting a new key in BST and returning the root"
+        n = self._new_node(key)
+        if root is None:
+            return n
+        keys, left, right = self.keys, self.left, self.right
+        c = root
+        while True:
+            if key > keys[c]:
+                if right[c] == -1:
+                    right[c] = n
+                    return root
+                c = right[c]
+            else:
+                if left[c] == -1:
+                    left[c] = n
+                    return root
+                c = left[c]
+
+    def delete(self, root, key):
+        """
+        Deleting desired key from BST and returning the (possibly new) root
+        A node with two children is replaced by the out-most right node of
+        its left sub-tree; the tree is returned unchanged if the key doesn't exist
+        """
+        keys, left, right = self.keys, self.left, self.right
+        parent = -1
+        c = -1 if root is None else root
+        while c != -1 and keys[c] != key:
+            parent = c
+            c = right[c] if key > keys[c] else left[c]
+        if c == -1:
+            return root
+        if left[c] != -1 and right[c] != -1:
+            target = c
+            parent = c
+            c = left[c]
+            while right[c] != -1:
+                parent = c
+                c = right[c]
+            keys[target] = keys[c]
+        child = left[c] if left[c] != -1 else right[c]
+        self._free_node(c)
+        if parent == -1:
+            return None if child == -1 else child
+        if left[parent] == c:
+            left[parent] = child
+        else:
+            right[parent] = child
+        return root
+
+    def min_value_node(self, root):
+        "Returns the minimum node in BST"
+        c = root
+        while self.left[c] != -1:
+            c = self.left[c]
+        return c
+
+    def max_value_node(self, root):
+        "Returns the maximum node in BST"
+        c = root
+        while self.right[c] != -1:
+            c = self.right[c]
+        return c
+
+
+if __name__ == "__main__":
+    #        4
+    #    2       6
+    #  1   3   5   7
+    # r = Node(4)
+    r = None
+    bst = BinarySearchTree()
+    r = bst.insert(r, 4)
+    r = bst.insert(r, 2)
+    r = bst.insert(r, 3)
+    r = bst.insert(r, 6)
+    r = bst.insert(r, 5)
+    r = bst.insert(r, 7)
+    r = bst.insert(r, 1)
+
+    # r = Node(4)
+    # r.left = Node(2)
+    # r.right = Node(6)
+    # r.left.left = Node(1)
+    # r.left.right = Node (3)
+    # r.right.left = Node(5)
+    # r.right.right = Node(7)
+
+    print(bst.inorder(r))
+    r = bst.insert(r, 8)
+    print(bst.inorder(r))
+    print(bst.min_value_node(r).key)
+    print(bst.max_value_node(r).key)
+    try:
+        print(bst.search(r, 9).key)
+    except AttributeError:
+        print("This key doesn't exist in BST")
+
+    r = bst.delete(r, 4)
+    print(bst.inorder(r))
+
+    # AVL tree stays balanced even when keys are inserted in sorted order
+    avl = AVLTree()
+    a = None
+    for k in range(1, 8):
+        a = avl.insert(a, k)
+    print(a.key, a.left.key, a.right.key)  # 4 2 6
+    print(avl.height(a))  # 3
+    a = avl.delete(a, 4)
+    avl.inorder(a)  # 1 2 3 5 6 7
+    print()
+
+    # order-statistics queries over the same balanced tree
+    ost = OrderStatisticTree()
+    o = None
+    for k in [50, 20, 70, 10, 30, 60, 80, 40]:
+        o = ost.insert(o, k)
+    print(ost.rank(o, 45))  # 4
+    print(ost.select(o, 0).key, ost.select(o, 7).key)  # 10 80
+    print(ost.count_range(o, 25, 65))  # 4
+    print(list(ost.range(o, 25, 65)))  # [30, 40, 50, 60]
+
+    # same BST stored in typed arrays; nodes are indices
+    abst = ArrayBinarySearchTree()
+    ar = None
+    for k in [4, 2, 3, 6, 5, 7, 1]:
+        ar = abst.insert(ar, k)
+    print(list(abst.inorder(ar)))  # [1, 2, 3, 4, 5, 6, 7]
+    ar = abst.delete(ar, 4)
+    print(abst.key(ar), abst.key(abst.max_value_node(ar)))  # 3 7
+    print(abst.search(ar, 4))  # None
+
+    # bulk loading a balanced tree from sorted keys and merging two trees
+    a = avl.from_sorted([1, 3, 5, 7, 9])
+    b = avl.from_sorted([2, 4, 6])
+    m = avl.merge(a, b)
+    print(list(avl.inorder_stack(m)), avl.height(m))  # [1, 2, 3, 4, 5, 6, 7, 9] 4
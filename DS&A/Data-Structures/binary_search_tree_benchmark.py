@@ -0,0 +1,103 @@
+# Benchmark: BinarySearchTree vs AVLTree
+# usage: python binary_search_tree_benchmark.py [n ...]
+# Sorted and adversarial (zig-zag) inputs turn the plain BST into a linked list,
+# so its recursive methods become O(n) per operation and soon hit the
+# recursion limit; AVLTree keeps every operation O(log n).
+# Building from sorted keys is also compared: n inserts vs from_sorted (O(n)).
+import random
+import sys
+import time
+
+from binary_search_tree import AVLTree, BinarySearchTree
+
+
+def sorted_keys(n):
+    "Keys in ascending order (what our ingest produces)"
+    return list(range(n))
+
+
+def random_keys(n):
+    "Keys in random order"
+    keys = list(range(n))
+    random.shuffle(keys)
+    return keys
+
+
+def adversarial_keys(n):
+    "Zig-zag keys (0, n-1, 1, n-2, ...) which also degrade a plain BST to O(n) height"
+    keys = []
+    lo, hi = 0, n - 1
+    while lo <= hi:
+        keys.append(lo)
+        if lo != hi:
+            keys.append(hi)
+        lo += 1
+        hi -= 1
+    return keys
+
+
+def run(tree, keys):
+    "Returns insert/search/delete timings in seconds for the given keys"
+    timings = {}
+    root = None
+    t = time.perf_counter()
+    for k in keys:
+        root = tree.insert(root, k)
+    timings["insert"] = time.perf_counter() - t
+    t = time.perf_counter()
+    for k in keys:
+        tree.search(root, k)
+    timings["search"] = time.perf_counter() - t
+    t = time.perf_counter()
+    for k in keys[::2]:
+        root = tree.delete(root, k)
+    timings["delete"] = time.perf_counter() - t
+    return timings
+
+
+def benchmark(sizes):
+    "Printing a timing table of both trees for every input shape and size"
+    inputs = {
+        "sorted": sorted_keys,
+        "random": random_keys,
+        "adversarial": adversarial_keys,
+    }
+    trees = {"BinarySearchTree": BinarySearchTree, "AVLTree": AVLTree}
+    print(f"{'n':>9} {'input':<12} {'tree':<17} {'insert':>9} {'search':>9} {'delete':>9}")
+    for n in sizes:
+        for input_name, make_keys in inputs.items():
+            keys = make_keys(n)
+            for tree_name, tree_class in trees.items():
+                try:
+                    t = run(tree_class(), keys)
+                except RecursionError:
+                    print(f"{n:>9} {input_name:<12} {tree_name:<17} RecursionError")
+                    continue
+                print(
+                    f"{n:>9} {input_name:<12} {tree_name:<17} "
+                    f"{t['insert']:>8.3f}s {t['search']:>8.3f}s {t['delete']:>8.3f}s"
+                )
+
+
+def benchmark_bulk_load(sizes):
+    "Printing the time of building an AVLTree from sorted keys: n inserts vs from_sorted"
+    print(f"{'n':>9} {'n inserts':>10} {'from_sorted':>12}")
+    for n in sizes:
+        keys = sorted_keys(n)
+        tree = AVLTree()
+        t = time.perf_counter()
+        root = None
+        for k in keys:
+            root = tree.insert(root, k)
+        inserts = time.perf_counter() - t
+        t = time.perf_counter()
+        tree.from_sorted(keys)
+        bulk = time.perf_counter() - t
+        print(f"{n:>9} {inserts:>9.3f}s {bulk:>11.3f}s")
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    benchmark(sizes)
+    print()
+    benchmark_bulk_load(sizes)
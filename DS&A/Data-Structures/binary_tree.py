@@ -4,10 +4,15 @@
 # Inorder: left / root* / right
 # Postorder: left / right / root*
 
+from collections import deque
+
 
 class Node:
     "Nodes are the data elements which trees consist of them"
 
+    # fixed attributes instead of a per-node __dict__ (a lot less memory per node)
+    __slots__ = ("data", "left", "right")
+
     def __init__(self, data, left=None, right=None):
         """creating a node with the given data which currently has no connection
         in left or right"""
@@ -29,16 +34,24 @@ class Node:
 
 
 class BinaryTree:
-    def __init__(self):
-        self.x = []
+    """
+    Traversals are lazy and iterative (generators yielding nodes' data), so
+    they neither build the whole result in memory nor hit the recursion limit:
+    depth-first ones keep O(height) nodes on their stack,
+    level-order keeps O(width) nodes in its queue and Morris ones use O(1)
+    """
 
     def inorder(self, root):
-        "Traversing binary tree using inorder method knowing the root node"
-        if root:
-            self.inorder(root.get_left())
-            self.x.append(root.get_data())
-            self.inorder(root.get_right())
-        return self.x
+        "Returns nodes' data using inorder method knowing the root node"
+        return list(self.inorder_stack(root))
+
+    def preorder(self, root):
+        "Returns nodes' data using preorder method knowing the root node"
+        return list(self.preorder_stack(root))
+
+    def postorder(self, root):
+        "Returns nodes' data using postorder method knowing the root node"
+        return list(self.postorder_stack(root))
 
     def inorder_stack(self, root):
         """Traversing binary tree using inorder method knowing the root node +
@@ -51,46 +64,108 @@ class BinaryTree:
                 c = c.left
             elif s:
                 c = s.pop()
-                print(c.data, end=" ")
+                yield c.data
                 c = c.right
             else:
                 break
 
+    @staticmethod
     def peek(stack):
         "Return the top data on the stack"
         if stack:
             return stack[-1]
         return
 
+    def preorder_stack(self, root):
+        """Traversing binary tree using preorder method knowing the root node +
+        stack data structure"""
+        s = [root] if root is not None else []
+        while s:
+            c = s.pop()
+            yield c.data
+            # right is pushed first so the left sub-tree is visited first
+            if c.right is not None:
+                s.append(c.right)
+            if c.left is not None:
+                s.append(c.left)
+
     def postorder_stack(self, root):
         """Traversing binary tree using postorder method knowing the root node +
         stack data structure"""
-        # not tested and evaluated yet
-        post = []
+        c = root
         s = []
-        while True:
-            if root.right is not None:
-                s.append(root.right)
-            s.append(root)
-            root = root.left
-            root = s.pop()
-            if r.right is not None and self.peek(s) == r.right:
-                s.pop()
-                s.append(root)
-                root = root.right
+        last = None  # last visited node
+        while s or c is not None:
+            if c is not None:
+                s.append(c)
+                c = c.left
             else:
-                post.append(root.data)
-                root = None
-            if len(s) <= 0:
-                break
+                top = self.peek(s)
+                if top.right is not None and top.right is not last:
+                    # right sub-tree has not been visited yet
+                    c = top.right
+                else:
+                    last = s.pop()
+                    yield last.data
+
+    def levelorder(self, root):
+        """Traversing binary tree level by level (BFS) knowing the root node +
+        queue data structure"""
+        q = deque([root] if root is not None else [])
+        while q:
+            c = q.popleft()
+            yield c.data
+            if c.left is not None:
+                q.append(c.left)
+            if c.right is not None:
+                q.append(c.right)
+
+    def _morris(self, root, preorder):
+        """
+        Morris traversal; instead of a stack, right pointer of each node's
+        inorder predecessor is temporarily threaded back to the node, and
+        removed again when the node is reached for the second time
+        """
+        c = root
+        while c is not None:
+            if c.left is None:
+                yield c
+                c = c.right
+                continue
+            p = c.left
+            while p.right is not None and p.right is not c:
+                p = p.right
+            if p.right is None:
+                # first visit: thread the predecessor and go left
+                if preorder:
+                    yield c
+                p.right = c
+                c = c.left
+            else:
+                # second visit: left sub-tree is done, remove the thread
+                p.right = None
+                if not preorder:
+                    yield c
+                c = c.right
 
-    def preorder(self, root):
-        "Traversing binary tree using preorder method knowing the root node"
-        if root:
-            self.x.append(root.get_data())
-            self.inorder(root.get_left())
-            self.inorder(root.get_right())
-        return self.x
+    def _morris_data(self, root, preorder):
+        walk = self._morris(root, preorder)
+        try:
+            for node in walk:
+                yield node.data
+        finally:
+            # if the traversal is stopped early, the walk is finished silently
+            # so that every temporary thread is removed and the tree is restored
+            for _ in walk:
+                pass
+
+    def inorder_morris(self, root):
+        "Traversing binary tree using inorder method with O(1) extra memory"
+        return self._morris_data(root, preorder=False)
+
+    def preorder_morris(self, root):
+        "Traversing binary tree using preorder method with O(1) extra memory"
+        return self._morris_data(root, preorder=True)
 
     def count_nodes(self, root):
         "Return total number of nodes in the binary tree"
@@ -113,26 +188,35 @@ class BinaryTree:
             return self.count_leaves(root.left) + self.count_leaves(root.right)
 
 
-#        1
-#    2       3
-#  4   5
-r = Node(1)
-r.left = Node(2)
-r.right = Node(3)
-r.left.left = Node(4)
-r.left.right = Node(5)
-
-bt = BinaryTree()
-print(bt.inorder(r))
-print(bt.count_nodes(r))
-print(bt.count_leaves(r))
-
-#        6
-#    7       8
-#  9  10  11
-root = Node(6, right=Node(8, left=Node(11)), left=Node(7, left=Node(9), right=Node(10)))
-
-bt2 = BinaryTree()
-print(bt2.inorder(root))
-print(bt2.count_nodes(root))
-print(bt2.count_leaves(root))
+if __name__ == "__main__":
+    #        1
+    #    2       3
+    #  4   5
+    r = Node(1)
+    r.left = Node(2)
+    r.right = Node(3)
+    r.left.left = Node(4)
+    r.left.right = Node(5)
+
+    bt = BinaryTree()
+    print(bt.inorder(r))
+    print(bt.count_nodes(r))
+    print(bt.count_leaves(r))
+
+    #        6
+    #    7       8
+    #  9  10  11
+    root = Node(6, right=Node(8, left=Node(11)), left=Node(7, left=Node(9), right=Node(10)))
+
+    bt2 = BinaryTree()
+    print(bt2.inorder(root))
+    print(bt2.count_nodes(root))
+    print(bt2.count_leaves(root))
+
+    print(bt.preorder(root))  # [6, 7, 9, 10, 8, 11]
+    print(bt.postorder(root))  # [9, 10, 7, 11, 8, 6]
+    print(list(bt.levelorder(root)))  # [6, 7, 8, 9, 10, 11]
+    print(list(bt.inorder_morris(root)))  # [9, 7, 10, 6, 11, 8]
+    for data in bt.preorder_morris(root):
+        print(data, end=" ")  # 6 7 9 10 8 11
+    print()
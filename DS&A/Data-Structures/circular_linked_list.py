@@ -19,8 +19,11 @@ class CircularLinkedList:
     linked list last node also points to the head (starting node)"""
 
     def __init__(self):
-        "starting our linked list and considering a head for the starting point"
+        """starting our linked list and considering a head for the starting point;
+        the tail (whose next is the head) is kept too, so that inserting at both
+        ends and removing the head don't have to walk around the list"""
         self.head = None
+        self.tail = None
         self.count = 0
 
     def display(self):
@@ -58,17 +61,22 @@ class CircularLinkedList:
             print("Index out of range!")
             return
         if self.head == None:
-            self.head = Node(new_data)
+            self.head = self.tail = Node(new_data)
             self.count += 1
             return
-        t = self.head
-        for _ in range(self.count - 1 if i - 1 == -1 else i - 1):
-            t = t.next
+        # the node before index i: the tail for both ends (O(1)), otherwise walking
+        t = self.tail
+        if 0 < i < self.count:
+            t = self.head
+            for _ in range(i - 1):
+                t = t.next
         a = t.next
         t.next = Node(new_data)
         t.next.next = a
         if i == 0:
             self.head = t.next
+        if i == self.count:
+            self.tail = t.next
         self.count += 1
         return
 
@@ -78,30 +86,89 @@ class CircularLinkedList:
             print("Index out of range!")
             return
         if self.count == 1:
-            self.head = None
+            self.head.next = None  # detached (see round_robin)
+            self.head = self.tail = None
             self.count = 0
             return
-        t = self.head
-        for _ in range(self.count - 1 if i - 1 == -1 else i - 1):
-            t = t.next
-        a = t.next.next
+        # the node before index i: the tail for the head (O(1)), otherwise walking
+        t = self.tail
+        if i > 0:
+            t = self.head
+            for _ in range(i - 1):
+                t = t.next
+        removed = t.next
+        a = removed.next
+        if removed is self.tail:
+            self.tail = t
         t.next = a
+        removed.next = None  # detached (see round_robin)
         if i == 0:
             self.head = a
         self.count -= 1
         return
 
+    def rotate(self, k=1):
+        """Moving the head k nodes forward (backward if k is negative); only the
+        head and tail references move: O(k mod size), O(1) for a single step"""
+        if not self.count:
+            return
+        for _ in range(k % self.count):
+            self.tail = self.head
+            self.head = self.head.next
+
+    def round_robin(self, weight=None):
+        """Infinite generator going around the list from the head: O(1) per value.
+        With weight (a function of a value), each value is yielded weight(value)
+        times in a row (weighted round-robin); values with weight 0 are skipped
+        and a whole lap without a positive weight raises ValueError.
+        Inserted/removed nodes are taken into account as the ring goes on; if
+        the current node is removed (even partway through its turn), it starts
+        over from the head.
+        It stops when the list becomes empty"""
+        t = self.head
+        skipped = 0  # nodes passed in a row without yielding
+        while self.head is not None:
+            if weight is None:
+                yield t.data
+            else:
+                times = weight(t.data)
+                skipped = 0 if times > 0 else skipped + 1
+                for _ in range(times):
+                    if t.next is None:
+                        break  # removed during its turn
+                    yield t.data
+                if skipped >= self.count:
+                    raise ValueError("no value has a positive weight")
+            # a removed node is detached (next is None): going back to the head
+            t = t.next if t.next is not None else self.head
+
+
+if __name__ == "__main__":
+    from itertools import islice
+
+    l = CircularLinkedList()
+    l.insert(11, 0)
+    l.insert(12, 1)
+    l.insert(13, 2)
+    l.display()  # 11 -> 12 -> 13 ->
+    print("\n")
+    l.insert(10, 0)
+    l.insert(14, 4)
+    l.insert(20, 2)
+    l.display()  # 10 -> 11 -> 20 -> 12 -> 13 -> 14 ->
+    print("\n")
+    l.remove(2)
+    l.display()  # 10 -> 11 -> 12 -> 13 -> 14 ->
+    print("\n")
+    l.rotate(2)
+    l.display()  # 12 -> 13 -> 14 -> 10 -> 11 ->
+    print("\n")
 
-l = CircularLinkedList()
-l.insert(11, 0)
-l.insert(12, 1)
-l.insert(13, 2)
-l.display()  # 11 -> 12 -> 13 ->
-print("\n")
-l.insert(10, 0)
-l.insert(14, 4)
-l.insert(20, 2)
-l.display()  # 10 -> 11 -> 20 -> 12 -> 13 -> 14 ->
-print("\n")
-l.remove(2)
-l.display()  # 10 -> 11 -> 12 -> 13 -> 14 ->
+    backends = CircularLinkedList()
+    for backend in [("a", 3), ("b", 1), ("c", 2)]:
+        backends.insert(backend, backends.size())
+    # ['a', 'b', 'c', 'a']
+    print([name for name, _ in islice(backends.round_robin(), 4)])
+    weighted = backends.round_robin(weight=lambda backend: backend[1])
+    # ['a', 'a', 'a', 'b', 'c', 'c', 'a', 'a']
+    print([name for name, _ in islice(weighted, 8)])
@@ -1,3 +1,9 @@
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+
+
 class CircularQueue:
     """simple demonstration of a circular queue and its relevant actions"""
 
@@ -52,10 +58,252 @@ class CircularQueue:
             self.queue[self.rear] = data
 
 
+class RingBuffer(CircularQueue):
+    """
+    Circular queue of fixed-size binary records (k slots of record_size bytes)
+    in a preallocated buffer: a bytearray, or shared memory so that a producer
+    process and a consumer process can exchange records without pickling.
+    Buffer layout: head & tail counters (on separate cache lines), then the slots;
+    counters only grow (slot = counter % k) so full/empty never look the same.
+    Single-producer/single-consumer (SPSC): only the producer writes tail and
+    only the consumer writes head, so no lock is needed (aligned 8-byte stores
+    are atomic and stay in order on x86-64; weaker CPUs would need fences).
+    Full policy: "block" waits for room, "drop" rejects the new record,
+    "overwrite" keeps writing and the consumer skips records it was lapped on;
+    like a seqlock, the producer publishes how far it is about to write
+    (write-start) before writing, so a consumer can tell a copy was torn
+    """
+
+    # head at byte 0, k & record_size at 8 & 16, tail & write-start at 64 & 72
+    HEADER = 128
+    POLICIES = ("block", "drop", "overwrite")
+
+    def __init__(self, k, record_size, policy="block", buffer=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {self.POLICIES}")
+        self.k = k
+        self.record_size = record_size
+        self.policy = policy
+        self.shm = None
+        size = self.HEADER + k * record_size
+        if buffer is None:
+            buffer = bytearray(size)
+        if len(buffer) < size:
+            raise ValueError("buffer is too small")
+        view = memoryview(buffer)
+        self._counters = view[: self.HEADER].cast("Q")
+        self._data = view[self.HEADER : size]
+        view.release()
+        if self._counters[1] == 0:
+            self._counters[1] = k
+            self._counters[2] = record_size
+        elif (self._counters[1], self._counters[2]) != (k, record_size):
+            raise ValueError("buffer holds a ring of another shape")
+
+    @classmethod
+    def create_shared(cls, k, record_size, policy="block"):
+        "Creating a ring buffer in a new shared memory block (see attach)"
+        shm = shared_memory.SharedMemory(create=True, size=cls.HEADER + k * record_size)
+        ring = cls(k, record_size, policy, shm.buf)
+        ring.shm = shm
+        return ring
+
+    @classmethod
+    def attach(cls, name, policy="block"):
+        "Opening the ring buffer of another process by its shared memory name"
+        shm = shared_memory.SharedMemory(name=name)
+        k, record_size = shm.buf[8:24].cast("Q")
+        ring = cls(k, record_size, policy, shm.buf)
+        ring.shm = shm
+        return ring
+
+    def close(self):
+        "Releasing the buffer (and closing the shared memory, if any)"
+        self._counters.release()
+        self._data.release()
+        if self.shm is not None:
+            self.shm.close()
+
+    @property
+    def head(self):
+        return self._counters[0]
+
+    @property
+    def tail(self):
+        return self._counters[8]
+
+    @property
+    def writing(self):
+        "Counter up to which the producer has started writing (>= tail)"
+        return max(self._counters[9], self._counters[8])
+
+    def __len__(self):
+        return min(self.tail - self.head, self.k)
+
+    def _wait_for_room(self, n, deadline):
+        """
+        Waiting (by polling: the peer may be another process) until n slots are
+        free or the deadline (time.monotonic(), None: no limit) has passed;
+        returns the number of free slots (may be less after the deadline)
+        """
+        delay = 0
+        while True:
+            free = self.k - (self.tail - self.head)
+            if free >= n or (deadline is not None and time.monotonic() >= deadline):
+                return free
+            time.sleep(delay)
+            delay = min(2 * delay or 1e-6, 1e-3)
+
+    def _write(self, tail, records, n):
+        "Copying n records into the slots starting at counter tail (<= 2 slices)"
+        size = self.record_size
+        start = tail % self.k
+        first = min(n, self.k - start)
+        self._data[start * size : (start + first) * size] = records[: first * size]
+        if first < n:
+            self._data[: (n - first) * size] = records[first * size : n * size]
+
+    def enqueue_many(self, records, timeout=None):
+        """
+        Adding records (a bytes-like of n * record_size bytes) to the end of the
+        queue; they are copied straight into the buffer slots (no per-record
+        objects). Returns how many were stored ("drop" stores what fits,
+        "block" waits for room unless timeout runs out)
+        """
+        records = memoryview(records).cast("B")
+        if len(records) % self.record_size:
+            raise ValueError("records must be a multiple of record_size bytes")
+        n = len(records) // self.record_size
+        # one deadline for the whole call, however many rounds it takes
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = 0
+        while done < n:
+            tail = self.tail
+            if self.policy == "overwrite":
+                room = min(n - done, self.k)
+            elif self.policy == "drop":
+                room = min(n - done, self.k - (tail - self.head))
+            else:
+                room = min(n - done, self._wait_for_room(1, deadline))
+            if room <= 0:
+                break
+            # claiming the slots first: records before writing - k may be overwritten
+            self._counters[9] = tail + room
+            self._write(tail, records[done * self.record_size :], room)
+            self._counters[8] = tail + room  # publishing after the data is written
+            done += room
+        records.release()
+        return done
+
+    def enqueue(self, data, timeout=None):
+        "Adding a record to the end of the queue; returns False if it wasn't stored"
+        return self.enqueue_many(data, timeout) == 1
+
+    def readable(self, n=None):
+        """
+        Zero-copy access: returns up to two memoryview slices (because of the
+        wrap-around) of up to n records from the front; call consume() when done.
+        With "overwrite" the producer may write over them, so copy if needed
+        """
+        while True:
+            # write-start before tail: the tail read is at least where its write began
+            writing = self.writing
+            head, tail = self.head, self.tail
+            if writing - head > self.k:
+                # lapped by the producer: skipping the (being) overwritten records
+                head = writing - self.k
+                self._counters[0] = head
+            # the tail may have moved on since: never more than the k slots
+            available = min(tail - head, self.k)
+            if self.writing - head <= self.k:
+                break
+            # the producer started writing over the front meanwhile: once more
+        n = available if n is None else min(n, available)
+        size = self.record_size
+        start = head % self.k
+        first = min(n, self.k - start)
+        views = [self._data[start * size : (start + first) * size]]
+        if first < n:
+            views.append(self._data[: (n - first) * size])
+        return views
+
+    def consume(self, n):
+        "Removing n records from the front (after reading them with readable)"
+        self._counters[0] = self.head + n
+
+    def dequeue_many(self, n, out=None):
+        """
+        Removing up to n records from the front, copied into out (a writable
+        buffer, e.g. a reused bytearray) or into a new bytes; returns (count, data)
+        """
+        while True:
+            views = self.readable(n)
+            head = self.head
+            count = sum(len(v) for v in views) // self.record_size
+            data = b"".join(views) if out is None else out
+            if out is not None:
+                offset = 0
+                for v in views:
+                    out[offset : offset + len(v)] = v
+                    offset += len(v)
+            for v in views:
+                v.release()
+            if self.policy == "overwrite" and self.writing - head > self.k:
+                # the producer started writing over the copied slots: it may be torn
+                continue
+            self.consume(count)
+            return count, data
+
+    def dequeue(self):
+        "Removing front record of the queue; returns None if it's empty"
+        count, data = self.dequeue_many(1)
+        return data if count else None
+
+    def display(self):
+        "Outputting the current records of the queue"
+        views = self.readable()
+        if not any(len(v) for v in views):
+            print("Queue is empty!")
+        for v in views:
+            for i in range(0, len(v), self.record_size):
+                print(v[i : i + self.record_size].hex(), end=" ")
+            v.release()
+
+
 # just a simple example:
-q = CircularQueue(3)
-q.display()
-q.enqueue("a")
-q.enqueue("b")
-q.enqueue("c")
-q.display()
+if __name__ == "__main__":
+    q = CircularQueue(3)
+    q.display()
+    q.enqueue("a")
+    q.enqueue("b")
+    q.enqueue("c")
+    q.display()
+    print()
+
+    # telemetry records: (timestamp: float64, value: int64)
+    record = struct.Struct("<dq")
+
+    def producer(name, n):
+        ring = RingBuffer.attach(name)
+        batch = bytearray(record.size * 100)
+        for start in range(0, n, 100):
+            for i in range(100):
+                record.pack_into(batch, i * record.size, time.time(), start + i)
+            ring.enqueue_many(batch)  # blocks while the consumer is behind
+        ring.close()
+
+    ring = RingBuffer.create_shared(1024, record.size)
+    p = multiprocessing.Process(target=producer, args=(ring.shm.name, 100_000))
+    p.start()
+    received = 0
+    total = 0
+    out = bytearray(record.size * 256)
+    while received < 100_000:
+        count, data = ring.dequeue_many(256, out)
+        for _, value in record.iter_unpack(memoryview(data)[: count * record.size]):
+            total += value
+        received += count
+    p.join()
+    print(received, total == sum(range(100_000)))  # 100000 True
+    ring.close()
+    ring.shm.unlink()
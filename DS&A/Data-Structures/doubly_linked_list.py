@@ -15,9 +15,48 @@ class DoublyLinkedList:
     node, next points to the next node after current node and prev points to
     the previous node before current node"""
 
-    def __init__(self):
-        "starting our linked list and considering a head for the starting point"
+    def __init__(self, indexed=False, key=None):
+        """starting our linked list and considering a head for the starting point;
+        tail (last node) and size are kept too, so both ends and len() are O(1).
+        An indexed list also keeps a dict of value (or key(value)) -> node, so
+        finding, removing and moving a value are O(1); its values must be unique"""
         self.head = None
+        self.tail = None
+        self.size = 0
+        self.key = key if key is not None else (lambda data: data)
+        self.index = {} if indexed else None
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, d):
+        return self.find(d) is not None
+
+    def _add(self, n):
+        "Registering a new node in the index (if the list is indexed)"
+        if self.index is not None:
+            k = self.key(n.data)
+            if k in self.index:
+                raise ValueError(f"{k!r} is already in the linked list")
+            self.index[k] = n
+        self.size += 1
+
+    def find(self, d):
+        "Returns the (first) node with the value (or key) d, None if it doesn't exist"
+        if self.index is not None:
+            return self.index.get(d)
+        t = self.head
+        while t is not None:
+            if self.key(t.data) == d:
+                return t
+            t = t.next
+        return None
+
+    def __iter__(self):
+        t = self.head
+        while t is not None:
+            yield t.data
+            t = t.next
 
     def display(self):
         "Displaying all of the nodes' values in our linked list"
@@ -31,23 +70,62 @@ class DoublyLinkedList:
         """Adding a node to the starting point of our linked list and
         adjusting the head position"""
         n = Node(new_data)
+        self._add(n)
+        self._link_front(n)
+
+    def _link_front(self, n):
+        n.prev = None
         n.next = self.head
         if self.head is not None:
             self.head.prev = n
+        else:
+            self.tail = n
         self.head = n
 
     def in_end(self, new_data):
         """Adding a node to the end of our linked list and telling the
-        previous last node where its next node is"""
+        previous last node (tail) where its next node is: O(1)"""
         n = Node(new_data)
+        self._add(n)
         if self.head is None:
             self.head = n
+        else:
+            self.tail.next = n
+            n.prev = self.tail
+        self.tail = n
+
+    def extend(self, iterable):
+        """Adding all values of the iterable to the end; the new nodes are
+        linked to each other first and then attached to the tail in one step"""
+        first = last = None
+        count = 0
+        for data in iterable:
+            n = Node(data)
+            if self.index is not None:
+                k = self.key(data)
+                if k in self.index:
+                    # unregistering the new nodes: nothing has been attached yet
+                    while first is not None:
+                        del self.index[self.key(first.data)]
+                        first = first.next
+                    raise ValueError(f"{k!r} is already in the linked list")
+                self.index[k] = n
+            if first is None:
+                first = n
+            else:
+                last.next = n
+                n.prev = last
+            last = n
+            count += 1
+        if first is None:
             return
-        t = self.head
-        while t.next:
-            t = t.next
-        t.next = n
-        n.prev = t
+        if self.head is None:
+            self.head = first
+        else:
+            self.tail.next = first
+            first.prev = self.tail
+        self.tail = last
+        self.size += count
 
     def in_after(self, node, new_data):
         """Adding a node after a specified node in our linked list"""
@@ -55,11 +133,14 @@ class DoublyLinkedList:
         if node is None:
             print("This node doesn't exist in your linked list")
             return
+        self._add(n)
         n.prev = node
         n.next = node.next
         node.next = n
         if n.next is not None:
             n.next.prev = n
+        else:
+            self.tail = n
 
     def in_before(self, node, new_data):
         """Adding a node before a specified node in our linked list"""
@@ -67,6 +148,7 @@ class DoublyLinkedList:
         if node is None:
             print("This node doesn't exist in your linked list")
             return
+        self._add(n)
         n.next = node
         n.prev = node.prev
         node.prev = n
@@ -75,49 +157,280 @@ class DoublyLinkedList:
         else:
             n.prev.next = n
 
-    def remove_node(self, d):
-        """Removing the desired node from the linked list"""
+    def _detach(self, t):
+        "Taking the node out of the chain (it stays in the index)"
+        if t.prev is None:
+            self.head = t.next
+        else:
+            t.prev.next = t.next
+        if t.next is None:
+            self.tail = t.prev
+        else:
+            t.next.prev = t.prev
+        t.next = None
+        t.prev = None
+
+    def unlink(self, t):
+        "Removing the given node from the linked list: O(1)"
+        self._detach(t)
+        if self.index is not None:
+            del self.index[self.key(t.data)]
+        self.size -= 1
+
+    def move_to_front(self, d):
+        """Moving the node with the value (or key) d to the start: O(1) if indexed.
+        Returns the node (None if it doesn't exist)"""
+        t = self.find(d)
+        if t is not None and t is not self.head:
+            self._detach(t)
+            self._link_front(t)
+        return t
+
+    def pop_front(self):
+        "Removing the first node and returning its value: O(1)"
+        if self.head is None:
+            raise IndexError("pop from an empty linked list")
         t = self.head
-        if t is not None:
-            if t.data == d:
-                t.next.prev = None
-                self.head = t.next
-                t.next = None
-                return
-            else:
-                while t.next is not None:
-                    if t.data == d:
-                        break
-                    t = t.next
-                if t.next:
-                    t.prev.next = t.next
-                    t.next.prev = t.prev
-                    t.next = None
-                    t.prev = None
-                else:
-                    t.prev.next = None
-                    t.prev = None
-                    return
+        self.unlink(t)
+        return t.data
+
+    def pop_back(self):
+        "Removing the last node and returning its value: O(1)"
+        if self.tail is None:
+            raise IndexError("pop from an empty linked list")
+        t = self.tail
+        self.unlink(t)
+        return t.data
+
+    def remove_node(self, d):
+        """Removing the (first) node with the desired value (or key) from the
+        linked list: O(1) if indexed. Returns False if it doesn't exist"""
+        t = self.find(d)
         if t is None:
-            return
+            return False
+        self.unlink(t)
+        return True
+
+
+class _Cache:
+    """Limits and statistics shared by the caches.
+    Limits: capacity (number of entries) and optionally max_weight, where
+    weigher(key, value) tells an entry's weight (e.g. its size in bytes).
+    on_evict(key, value) is called for every entry evicted to make room"""
+
+    def __init__(self, capacity, max_weight=None, weigher=None, on_evict=None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.max_weight = max_weight
+        self.weigher = weigher if weigher is not None else (lambda key, value: 1)
+        self.on_evict = on_evict
+        self.weight = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def _over(self, extra=0, extra_weight=0):
+        "True if the limits don't hold (with room for extra entries and weight)"
+        return len(self) + extra > self.capacity or (
+            self.max_weight is not None and self.weight + extra_weight > self.max_weight
+        )
+
+    def stats(self):
+        "Returns hits, misses, evictions and the hit rate"
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class LRUCache(_Cache):
+    """Least Recently Used cache: an indexed doubly linked list of (key, value)
+    ordered by use (head is the most recent) gives O(1) get/put/eviction
+    (see _Cache for the limits)"""
+
+    def __init__(self, capacity, max_weight=None, weigher=None, on_evict=None):
+        super().__init__(capacity, max_weight, weigher, on_evict)
+        self._entries = DoublyLinkedList(indexed=True, key=lambda entry: entry[0])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        "Checking a key without counting it as a use"
+        return key in self._entries
+
+    def get(self, key, default=None):
+        "Returns the value of the key (marking it as recently used) or default"
+        node = self._entries.move_to_front(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return node.data[1]
+
+    def put(self, key, value):
+        "Adding (or replacing) the value of the key, evicting what doesn't fit"
+        node = self._entries.move_to_front(key)
+        if node is not None:
+            self.weight -= self.weigher(*node.data)
+            node.data = (key, value)
+        else:
+            self._entries.in_start((key, value))
+        self.weight += self.weigher(key, value)
+        self._evict()
+
+    def remove(self, key):
+        "Removing the key (without calling on_evict); returns False if it doesn't exist"
+        node = self._entries.find(key)
+        if node is None:
+            return False
+        self._entries.unlink(node)
+        self.weight -= self.weigher(*node.data)
+        return True
+
+    def _evict(self):
+        "Evicting least recently used entries (from the tail) until the limits hold"
+        while len(self._entries) and self._over():
+            key, value = self._entries.pop_back()
+            self.weight -= self.weigher(key, value)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+
+class LFUCache(_Cache):
+    """Least Frequently Used cache: entries with the same number of uses are
+    kept in an indexed doubly linked list (ordered by recency, so ties are
+    evicted LRU), and the lowest use count is tracked, so get/put are O(1).
+    When remove() (or an eviction) empties the lowest bucket, the lowest count
+    is unknown until the next new key sets it to 1; an eviction before that
+    finds it by scanning the distinct use counts (see _Cache for the limits)"""
+
+    def __init__(self, capacity, max_weight=None, weigher=None, on_evict=None):
+        super().__init__(capacity, max_weight, weigher, on_evict)
+        self._buckets = {}  # uses -> DoublyLinkedList of (key, value)
+        self._uses = {}  # key -> uses
+        self._min_uses = None  # None: unknown (found lazily by _evict)
+
+    def __len__(self):
+        return len(self._uses)
+
+    def __contains__(self, key):
+        return key in self._uses
+
+    def _bucket(self, uses):
+        bucket = self._buckets.get(uses)
+        if bucket is None:
+            bucket = DoublyLinkedList(indexed=True, key=lambda entry: entry[0])
+            self._buckets[uses] = bucket
+        return bucket
+
+    def _touch(self, key):
+        "Moving the entry of the key to the next bucket; returns its node"
+        uses = self._uses[key]
+        bucket = self._buckets[uses]
+        node = bucket.find(key)
+        bucket.unlink(node)
+        if not len(bucket):
+            del self._buckets[uses]
+            if self._min_uses == uses:
+                self._min_uses = uses + 1
+        self._uses[key] = uses + 1
+        bucket = self._bucket(uses + 1)
+        bucket.in_start(node.data)
+        return bucket.head
+
+    def get(self, key, default=None):
+        "Returns the value of the key (counting a use) or default"
+        if key not in self._uses:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return self._touch(key).data[1]
+
+    def put(self, key, value):
+        "Adding (or replacing) the value of the key, evicting what doesn't fit"
+        weight = self.weigher(key, value)
+        if key in self._uses:
+            node = self._touch(key)
+            self.weight += weight - self.weigher(*node.data)
+            node.data = (key, value)
+        else:
+            # making room first, so that the new entry (used once) isn't the one evicted
+            self._evict(extra=1, extra_weight=weight)
+            self._uses[key] = 1
+            self._bucket(1).in_start((key, value))
+            self._min_uses = 1
+            self.weight += weight
+        self._evict()
+
+    def remove(self, key):
+        "Removing the key (without calling on_evict); returns False if it doesn't exist"
+        uses = self._uses.pop(key, None)
+        if uses is None:
+            return False
+        bucket = self._buckets[uses]
+        node = bucket.find(key)
+        bucket.unlink(node)
+        if not len(bucket):
+            del self._buckets[uses]
+            if self._min_uses == uses:
+                self._min_uses = None
+        self.weight -= self.weigher(*node.data)
+        return True
+
+    def _evict(self, extra=0, extra_weight=0):
+        "Evicting least frequently used entries until the limits hold (with extra room)"
+        while self._uses and self._over(extra, extra_weight):
+            if self._min_uses is None:
+                self._min_uses = min(self._buckets)
+            key, value = self._buckets[self._min_uses].tail.data
+            self.remove(key)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(key, value)
+
+
+if __name__ == "__main__":
+    l = DoublyLinkedList()
+    l.extend([3, 4, 5])
+    z = l.tail
+
+    l.in_start(2)
+    l.in_end(7)
+    l.in_after(z, 6)
+    l.in_after(l.head.next.next, 4.5)
+    l.display()
+    # 2 <-> 3 <-> 4 <-> 4.5 <-> 5 <-> 6 <-> 7 <-> Null
+    l.remove_node(4.5)
+    l.display()
+    # 2 <-> 3 <-> 4 <-> 5 <-> 6 <-> 7 <-> Null
+    print(len(l), l.pop_front(), l.pop_back(), list(l))
+    # 6 2 7 [3, 4, 5, 6]
+
+    l = DoublyLinkedList(indexed=True)
+    l.extend("abcd")
+    l.move_to_front("c")
+    l.remove_node("b")
+    print(list(l), "a" in l, "b" in l)  # ['c', 'a', 'd'] True False
 
+    evicted = []
+    cache = LRUCache(2, on_evict=lambda key, value: evicted.append(key))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)  # evicts "b", the least recently used
+    print(cache.get("b"), cache.get("c"), evicted)  # None 3 ['b']
+    # {'hits': 2, 'misses': 1, 'evictions': 1, 'hit_rate': 0.666...}
+    print(cache.stats())
 
-x = Node(3)
-y = Node(4)
-z = Node(5)
-l = DoublyLinkedList()
-l.head = x
-x.next = y
-y.next = z
-y.prev = x
-z.prev = y
-
-l.in_start(2)
-l.in_end(7)
-l.in_after(z, 6)
-l.in_after(l.head.next.next, 4.5)
-l.display()
-# 2 <-> 3 <-> 4 <-> 4.5 <-> 5 <-> 6 <-> 7 <-> Null
-l.remove_node(4.5)
-l.display()
-# 2 <-> 3 <-> 4 <-> 5 <-> 6 <-> 7 <-> Null
+    cache = LFUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    cache.put("c", 3)  # evicts "b", the least frequently used
+    print("a" in cache, "b" in cache, "c" in cache)  # True False True
@@ -0,0 +1,266 @@
+# Direction-optimising, level-synchronous BFS over CSR graphs (requires numpy)
+# The BFS of graph_traverse.py takes one vertex at a time. Here a whole level
+# (the frontier) is expanded at once with array operations, in one of two ways:
+# - top-down: gather the neighbors of all frontier vertices and keep the
+#   unvisited ones; costs the edges of the frontier
+# - bottom-up: for all unvisited vertices, check if any of their (incoming)
+#   neighbors is in the frontier; costs the edges of the unvisited vertices
+# The frontier is small at the start and the end of a search and huge in the
+# middle (in small-world graphs most vertices are a few hops away), so the
+# search switches to bottom-up when the frontier's edges exceed 1/alpha of the
+# unvisited vertices' edges, and back to top-down when the frontier has fewer
+# than n/beta vertices (Beamer et al., "Direction-Optimizing BFS").
+# With workers, the vertex set is split in ranges and each worker process
+# expands the part of the level it owns; the arrays are in shared memory.
+from multiprocessing import Barrier, Process, shared_memory
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from graph_csr import CSRGraph
+
+# vertices processed at once by the bottom-up step (bounds temporary memory)
+_CHUNK = 1 << 18
+
+
+def _gather(offsets, targets, vertices):
+    "Returns the neighbors of the given vertices (concatenated) and how many each has"
+    starts = offsets[vertices]
+    lengths = offsets[vertices + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return targets[:0], lengths
+    # index of every neighbor: its segment's start + its position in the segment
+    shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return targets[shift + np.arange(total)], lengths
+
+
+def _top_down(offsets, targets, dist, frontier, level):
+    "Visiting the unvisited neighbors of the frontier; returns them (sorted)"
+    neighbors, _ = _gather(offsets, targets, frontier)
+    new = np.unique(neighbors[dist[neighbors] < 0])
+    dist[new] = level
+    return new
+
+
+def _bottom_up(in_offsets, in_targets, dist, vertices, level):
+    "Visiting the given unvisited vertices which have a neighbor in the frontier"
+    found = []
+    for i in range(0, len(vertices), _CHUNK):
+        chunk = vertices[i : i + _CHUNK]
+        parents, lengths = _gather(in_offsets, in_targets, chunk)
+        if not parents.size:
+            continue
+        hit = dist[parents] == level - 1
+        has = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[has]
+        # any() of every (non-empty) segment of hits
+        reached = chunk[has][np.logical_or.reduceat(hit, starts)]
+        dist[reached] = level
+        found.append(reached)
+    return np.concatenate(found) if found else vertices[:0]
+
+
+# ------------- Worker processes -------------
+# Levels are synchronised with two barriers: the main process writes the step
+# (direction, level, frontier size) into a shared control array and every
+# worker waits at `start`; all of them wait at `done` when their part is done.
+def _attach(specs, blocks, arrays):
+    "Opening the shared arrays (and their memory blocks, to keep them open)"
+    for name, (shm_name, shape, dtype) in specs.items():
+        blocks[name] = shared_memory.SharedMemory(name=shm_name)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=blocks[name].buf)
+
+
+def _worker(lo, hi, specs, start, done):
+    "Worker process: expanding its part of every level (vertices lo..hi-1)"
+    blocks, a = {}, {}
+    try:
+        _attach(specs, blocks, a)
+        while True:
+            start.wait()
+            top_down, level, stop, size = a["control"]
+            if stop:
+                break
+            if top_down:
+                # the frontier is sorted: the owned vertices are a slice of it
+                frontier = a["frontier"][:size]
+                i, j = np.searchsorted(frontier, [lo, hi])
+                _top_down(a["offsets"], a["targets"], a["dist"], frontier[i:j], level)
+            else:
+                vertices = lo + np.flatnonzero(a["dist"][lo:hi] < 0)
+                _bottom_up(a["in_offsets"], a["in_targets"], a["dist"], vertices, level)
+            done.wait()
+    except BaseException:
+        # the main process fails instead of waiting forever (at either barrier)
+        start.abort()
+        done.abort()
+        raise
+    finally:
+        a.clear()
+        for shm in blocks.values():
+            shm.close()
+
+
+class _SharedArrays:
+    "Copies of arrays in shared memory (for the worker processes)"
+
+    def __init__(self, **arrays):
+        self.blocks = {}
+        self.arrays = {}
+        self.specs = {}
+        for name, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            shared[:] = array
+            self.blocks[name] = shm
+            self.arrays[name] = shared
+            self.specs[name] = (shm.name, array.shape, array.dtype.str)
+
+    def close(self):
+        self.arrays.clear()
+        for shm in self.blocks.values():
+            shm.close()
+            shm.unlink()
+
+
+# ------------- Search -------------
+def _reverse(offsets, targets):
+    "Returns the CSR arrays of the reversed (incoming) edges"
+    n = len(offsets) - 1
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    reverse = CSRGraph.from_edges(n, targets, sources, directed=True)
+    return reverse.offsets, reverse.targets
+
+
+def bfs(
+    graph: CSRGraph, source, max_depth=None, alpha=14, beta=24, workers=None, trace=None
+):
+    """
+    Returns an array of the distances (number of edges) from the source to
+    every vertex; -1 for vertices which aren't reachable (within max_depth).
+    alpha=0: top-down only; beta: see the top of the module.
+    workers: number of processes to split every level between (None: this one).
+    trace: a list to append the direction ("top-down"/"bottom-up") of every level to
+    """
+    offsets, targets, _ = graph.csr()
+    n = graph.V
+    if graph.directed:
+        in_offsets, in_targets = _reverse(offsets, targets)
+    else:
+        in_offsets, in_targets = offsets, targets
+    degrees = np.diff(offsets)
+    dist = np.full(n, -1, dtype=np.int64)
+    dist[source] = 0
+    frontier = np.array([source])
+    unvisited_edges = int(degrees.sum()) - int(degrees[source])
+    top_down = True
+    level = 0
+    processes = shared = None
+    if workers:
+        shared = _SharedArrays(
+            offsets=offsets,
+            targets=targets,
+            in_offsets=in_offsets,
+            in_targets=in_targets,
+            dist=dist,
+            frontier=np.zeros(n, dtype=np.int64),
+            control=np.zeros(4, dtype=np.int64),
+        )
+        dist = shared.arrays["dist"]
+        control = shared.arrays["control"]
+        start, done = Barrier(workers + 1), Barrier(workers + 1)
+        bounds = np.linspace(0, n, workers + 1).astype(np.int64)
+        processes = [
+            Process(
+                target=_worker,
+                args=(bounds[i], bounds[i + 1], shared.specs, start, done),
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        for p in processes:
+            p.start()
+    try:
+        while frontier.size and (max_depth is None or level < max_depth):
+            level += 1
+            frontier_edges = int(degrees[frontier].sum())
+            if top_down and frontier_edges * alpha > unvisited_edges:
+                top_down = False
+            elif not top_down and frontier.size < n / beta:
+                top_down = True
+            if trace is not None:
+                trace.append("top-down" if top_down else "bottom-up")
+            if processes is None:
+                if top_down:
+                    frontier = _top_down(offsets, targets, dist, frontier, level)
+                else:
+                    unvisited = np.flatnonzero(dist < 0)
+                    frontier = _bottom_up(
+                        in_offsets, in_targets, dist, unvisited, level
+                    )
+            else:
+                shared.arrays["frontier"][: frontier.size] = frontier
+                control[:] = (top_down, level, 0, frontier.size)
+                try:
+                    start.wait()
+                    done.wait()
+                except BrokenBarrierError:
+                    raise RuntimeError("a BFS worker process failed") from None
+                except KeyboardInterrupt:
+                    done.abort()
+                    raise
+                frontier = np.flatnonzero(dist == level)
+            unvisited_edges -= int(degrees[frontier].sum())
+        return dist.copy() if shared is not None else dist
+    finally:
+        if processes is not None:
+            if start.broken or done.broken:
+                # a worker failed (or the search was interrupted): stopping all of them
+                start.abort()
+                for p in processes:
+                    p.terminate()
+            else:
+                control[2] = 1  # stop
+                start.wait()
+            for p in processes:
+                p.join()
+            shared.close()
+
+
+def reachable(graph: CSRGraph, source, max_depth=None, **options):
+    "Returns the vertices reachable from the source in max_depth hops: the blast radius"
+    return np.flatnonzero(bfs(graph, source, max_depth, **options) >= 0)
+
+
+if __name__ == "__main__":
+    import time
+
+    from graph_traverse import bfs_bitset
+
+    edges = [(0, 1), (0, 4), (1, 2), (1, 3), (1, 4), (2, 3), (3, 4), (5, 6)]
+    g = CSRGraph.from_edges(7, [u for u, _ in edges], [v for _, v in edges])
+    print(bfs(g, 2))  # [ 2  1  0  1  2 -1 -1]
+    print(reachable(g, 0, max_depth=1))  # [0 1 4]
+
+    # a small-world graph: a few hops from every vertex to most of the others
+    n, m = 1_000_000, 8_000_000
+    rng = np.random.default_rng(0)
+    g = CSRGraph.from_edges(n, rng.integers(0, n, m), rng.integers(0, n, m))
+    trace = []
+    t = time.perf_counter()
+    dist = bfs(g, 0, trace=trace)
+    print(f"direction-optimising: {time.perf_counter() - t:.2f}s {trace}")
+    t = time.perf_counter()
+    top_down_only = bfs(g, 0, alpha=0)
+    print(f"top-down only:        {time.perf_counter() - t:.2f}s")
+    t = time.perf_counter()
+    parallel = bfs(g, 0, workers=2)
+    print(f"2 worker processes:   {time.perf_counter() - t:.2f}s")
+    offsets, targets, _ = g.csr()
+    lists = np.split(targets, offsets[1:-1])
+    t = time.perf_counter()
+    count = sum(1 for _ in bfs_bitset(lists, 0))
+    print(f"graph_traverse:       {time.perf_counter() - t:.2f}s")
+    assert (dist == top_down_only).all() and (dist == parallel).all()
+    assert count == (dist >= 0).sum()
@@ -0,0 +1,313 @@
+# Graph in CSR (Compressed Sparse Row) format (requires numpy)
+# GraphNode (graph.py) allocates a Node object per edge direction and a
+# traversal chases their pointers. In CSR all adjacency lists are stored one
+# after another in a single `targets` array (with a parallel `weights` array),
+# and the neighbors of v are targets[offsets[v]:offsets[v + 1]]:
+#   edges 0-1, 0-2, 1-2  ->  offsets = [0, 2, 4, 6], targets = [1, 2, 0, 2, 0, 1]
+# so an edge costs 4 (or 8) bytes and a neighbor list is a contiguous slice.
+# The arrays are built in bulk (sorting the edge list by source) and are
+# read-only; edges added/removed later go to a delta buffer (a dict of small
+# lists and a dict of removed targets) which is merged into new arrays by
+# compact(), automatically once it reaches a fraction of the graph's size.
+import numpy as np
+
+
+class CSRGraph:
+    def __init__(
+        self,
+        n,
+        offsets=None,
+        targets=None,
+        weights=None,
+        directed=False,
+        compact_ratio=0.1,
+        loops=None,
+    ):
+        """
+        Creating a graph with n vertices (0..n-1) from CSR arrays (see from_edges);
+        without arrays the graph has no edges (an empty weighted graph:
+        CSRGraph.from_edges(n, [], [], [])). weights=None: unweighted graph;
+        loops: number of self-loops (counted from the arrays if not given)
+        """
+        self.V = n
+        self.directed = directed
+        self.compact_ratio = compact_ratio
+        self.dtype = np.int32 if n < 2**31 else np.int64
+        self.weighted = weights is not None
+        if offsets is None:
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            targets = np.zeros(0, dtype=self.dtype)
+            weights = np.zeros(0, dtype=np.float64) if self.weighted else None
+        if loops is None:
+            loops = np.count_nonzero(
+                targets == np.repeat(np.arange(n), np.diff(offsets))
+            )
+        self._set_arrays(offsets, targets, weights, int(loops))
+
+    def _set_arrays(self, offsets, targets, weights, loops):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        for array in (offsets, targets, weights):
+            if array is not None:
+                array.flags.writeable = False
+        self._added = {}  # source -> ([targets], [weights]) added since compact
+        self._removed = {}  # source -> set of targets removed from the arrays
+        self._delta = 0  # number of edge directions in the buffer
+        self._edges = len(targets)  # number of edge directions (a self-loop has one)
+        self._loops = loops
+
+    @classmethod
+    def from_edges(
+        cls, n, sources, targets, weights=None, directed=False, compact_ratio=0.1
+    ):
+        """
+        Building a graph from an edge list (arrays of sources, targets and
+        optionally weights) in O(E log E); undirected edges are stored in both
+        directions (self-loops once). Neighbors keep the order of the edge list
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+        loop = sources == targets
+        if not directed:
+            back = ~loop
+            sources, targets = (
+                np.concatenate([sources, targets[back]]),
+                np.concatenate([targets, sources[back]]),
+            )
+            if weights is not None:
+                weights = np.concatenate([weights, weights[back]])
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=offsets[1:])
+        dtype = np.int32 if n < 2**31 else np.int64
+        return cls(
+            n,
+            offsets,
+            targets[order].astype(dtype),
+            weights[order] if weights is not None else None,
+            directed,
+            compact_ratio,
+            np.count_nonzero(loop),
+        )
+
+    @classmethod
+    def from_adjacency(cls, G: dict, directed=True):
+        """
+        Building a graph from a dictionary of integer vertex -> list of neighbors
+        (like the graphs of graph_traverse.py), keeping the order of the lists
+        """
+        vertices = [v for v in G] + [u for neighbors in G.values() for u in neighbors]
+        n = max(vertices, default=-1) + 1
+        degrees = np.array([len(G.get(v, ())) for v in range(n)], dtype=np.int64)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        targets = np.fromiter(
+            (u for v in range(n) for u in G.get(v, ())),
+            dtype=np.int64,
+            count=int(offsets[-1]),
+        )
+        targets = targets.astype(np.int32 if n < 2**31 else np.int64)
+        return cls(n, offsets, targets, None, directed)
+
+    def __len__(self):
+        return self.V
+
+    def edge_count(self):
+        "Returns the number of edges (each undirected edge counts once)"
+        return self._edges if self.directed else (self._edges + self._loops) // 2
+
+    def _is_clean(self, v):
+        return v not in self._added and v not in self._removed
+
+    def neighbors(self, v):
+        """
+        Returns the neighbors of the vertex as an array: a read-only view of the
+        targets array (no copy) unless the vertex has changes in the buffer
+        """
+        start, end = self.offsets[v], self.offsets[v + 1]
+        if self._is_clean(v):
+            return self.targets[start:end]
+        return self.edges(v)[0]
+
+    def edges(self, v):
+        "Returns the neighbors of the vertex and the edge weights (None if unweighted)"
+        start, end = self.offsets[v], self.offsets[v + 1]
+        targets = self.targets[start:end]
+        weights = self.weights[start:end] if self.weighted else None
+        if self._is_clean(v):
+            return targets, weights
+        removed = self._removed.get(v)
+        if removed:
+            keep = ~np.isin(targets, list(removed))
+            targets = targets[keep]
+            weights = weights[keep] if self.weighted else None
+        added = self._added.get(v)
+        if added:
+            targets = np.concatenate([targets, np.array(added[0], dtype=targets.dtype)])
+            if self.weighted:
+                weights = np.concatenate(
+                    [weights, np.array(added[1], dtype=np.float64)]
+                )
+        return targets, weights
+
+    def degree(self, v=None):
+        "Returns the degree of the vertex, or an array of (out) degrees of all vertices"
+        if v is not None:
+            return len(self.neighbors(v))
+        degrees = np.diff(self.offsets)
+        if self._delta:
+            degrees = degrees.copy()
+            for u in self._added.keys() | self._removed.keys():
+                degrees[u] = len(self.neighbors(u))
+        return degrees
+
+    def has_edge(self, source, target):
+        return bool(np.any(self.neighbors(source) == target))
+
+    def _add(self, source, target, weight):
+        targets, weights = self._added.setdefault(source, ([], []))
+        targets.append(target)
+        weights.append(weight)
+        self._delta += 1
+        self._edges += 1
+        self._loops += source == target
+
+    def add_edge(self, source, target, weight=1.0):
+        "Adding an edge; it goes to the buffer until the next compact()"
+        self._add(source, target, weight)
+        if not self.directed and source != target:
+            self._add(target, source, weight)
+        self._maybe_compact()
+
+    def _remove(self, source, target):
+        start, end = self.offsets[source], self.offsets[source + 1]
+        removed = self._removed.setdefault(source, set())
+        if target not in removed:
+            count = int(np.count_nonzero(self.targets[start:end] == target))
+            if count:
+                removed.add(target)
+                self._delta += count
+                self._edges -= count
+                self._loops -= count if source == target else 0
+            elif not removed:
+                del self._removed[source]
+        added = self._added.get(source)
+        if added and target in added[0]:
+            keep = [i for i, t in enumerate(added[0]) if t != target]
+            count = len(added[0]) - len(keep)
+            self._edges -= count
+            self._delta -= count
+            self._loops -= count if source == target else 0
+            added[0][:] = [added[0][i] for i in keep]
+            added[1][:] = [added[1][i] for i in keep]
+            if not added[0]:
+                del self._added[source]
+
+    def remove_edge(self, source, target):
+        "Removing all edges from source to target (and back, if undirected)"
+        self._remove(source, target)
+        if not self.directed and source != target:
+            self._remove(target, source)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._delta > self.compact_ratio * max(len(self.targets), 1024):
+            self.compact()
+
+    def compact(self):
+        "Merging the buffered changes into new CSR arrays: O(V + E)"
+        if not self._delta and not self._added and not self._removed:
+            return
+        degrees = np.diff(self.offsets)
+        keep = np.ones(len(self.targets), dtype=bool)
+        for v, removed in self._removed.items():
+            start, end = self.offsets[v], self.offsets[v + 1]
+            keep[start:end] = ~np.isin(self.targets[start:end], list(removed))
+        sources = np.repeat(np.arange(self.V), degrees)[keep]
+        targets = self.targets[keep]
+        weights = self.weights[keep] if self.weighted else None
+        if self._added:
+            added_sources = np.concatenate(
+                [
+                    np.full(len(t), v, dtype=np.int64)
+                    for v, (t, _) in self._added.items()
+                ]
+            )
+            added_targets = np.concatenate(
+                [np.array(t, dtype=np.int64) for t, _ in self._added.values()]
+            )
+            sources = np.concatenate([sources, added_sources])
+            targets = np.concatenate([targets, added_targets])
+            if self.weighted:
+                added_weights = np.concatenate(
+                    [np.array(w, dtype=np.float64) for _, w in self._added.values()]
+                )
+                weights = np.concatenate([weights, added_weights])
+        # both directions of undirected edges are already in the lists
+        graph = CSRGraph.from_edges(self.V, sources, targets, weights, directed=True)
+        self._set_arrays(graph.offsets, graph.targets, graph.weights, graph._loops)
+
+    def csr(self):
+        """
+        Returns the (offsets, targets, weights) arrays after compacting: the fast
+        path for traversals, which can index the arrays directly
+        """
+        self.compact()
+        return self.offsets, self.targets, self.weights
+
+    def nbytes(self):
+        "Returns the memory used by the arrays in bytes"
+        return sum(
+            a.nbytes
+            for a in (self.offsets, self.targets, self.weights)
+            if a is not None
+        )
+
+    def print_list(self):
+        "printing graph adjacency list in a structured and readable way"
+        for i in range(self.V):
+            print(i, ": head", end=" ")
+            for t in self.neighbors(i):
+                print("->  {}".format(t), end=" ")
+            print()
+
+
+if __name__ == "__main__":
+    import time
+
+    # the graph of graph.py (GraphNode) built in bulk; neighbor lists keep the
+    # edge list order (GraphNode prepends, so its lists are reversed)
+    edges = [(0, 1), (0, 4), (1, 2), (1, 3), (1, 4), (2, 3), (3, 4)]
+    g = CSRGraph.from_edges(5, [u for u, _ in edges], [v for _, v in edges])
+    g.print_list()
+    # 0 : head ->  1 ->  4
+    # 1 : head ->  2 ->  3 ->  4 ->  0
+    # 2 : head ->  3 ->  1
+    # 3 : head ->  4 ->  1 ->  2
+    # 4 : head ->  0 ->  1 ->  3
+    g.add_edge(2, 4)
+    g.remove_edge(0, 1)
+    print(g.neighbors(4), g.degree(), g.edge_count())  # [0 1 3 2] [1 3 3 3 4] 7
+    g.compact()
+    print(g.offsets, g.targets)  # [ 0  1  4  7 10 14] [4 2 3 4 3 1 4 4 1 2 0 1 3 2]
+
+    w = CSRGraph.from_edges(3, [0, 1], [1, 2], [2.5, 4.0], directed=True)
+    print(w.edges(0))  # (array([1], dtype=int32), array([2.5]))
+    print(w.edges(1))  # (array([2], dtype=int32), array([4.]))
+
+    # tens of millions of edge directions
+    n, m = 1_000_000, 10_000_000
+    rng = np.random.default_rng(0)
+    sources, targets = rng.integers(0, n, m), rng.integers(0, n, m)
+    t = time.perf_counter()
+    g = CSRGraph.from_edges(n, sources, targets)
+    seconds, megabytes = time.perf_counter() - t, g.nbytes() / 2**20
+    print(f"built {g.edge_count()} edges in {seconds:.2f}s, {megabytes:.0f}MB")
+    t = time.perf_counter()
+    for k in range(10_000):
+        g.add_edge(k, k + 1)
+    g.compact()
+    print(f"added 10000 edges and compacted in {time.perf_counter() - t:.2f}s")
@@ -0,0 +1,281 @@
+# Graph adjacency matrices over NumPy arrays (requires numpy)
+# GraphMatrix (graph.py) keeps a list of Python int lists: a pointer (8 bytes)
+# per cell, so 50k vertices need ~20GB. Same API (add_edge/remove_edge/
+# print_matrix) in far less memory, with vectorised queries:
+# - BoolGraphMatrix: one byte per cell (n x n uint8 or bool array, 50k vertices
+#   -> 2.5GB); reachability and triangle counting use matrix products (BLAS),
+#   computed in blocks of rows so the float copies stay small
+# - BitGraphMatrix: one bit per cell (rows packed in (n + 7) // 8 bytes, 50k
+#   vertices -> ~312MB); the boolean product of rows is a bytewise AND / OR
+import numpy as np
+
+# number of 1 bits of every byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+# rows of the matrix processed at once (bounds temporary memory)
+_CHUNK = 4096
+# rows of the float32 blocks multiplied at once (2 x 1024 x 50k -> ~400MB)
+_BLOCK = 1024
+
+
+def _pairs(pairs):
+    "Returns the two columns of an array (or list) of (v1, v2) pairs"
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+class BoolGraphMatrix:
+    def __init__(self, n: int, dtype=np.uint8):
+        """
+        Creating an undirected graph with n vertices
+        and an n x n adjacency matrix of the given dtype (uint8 or bool)
+        """
+        self.size = n
+        self.M = np.zeros((n, n), dtype=dtype)
+
+    def add_edge(self, v1, v2):
+        "Adding edges to the undirected graph matrix"
+        self.M[v1, v2] = 1
+        self.M[v2, v1] = 1
+
+    def remove_edge(self, v1, v2):
+        "Removing edges from the undirected graph matrix"
+        self.M[v1, v2] = 0
+        self.M[v2, v1] = 0
+
+    def add_edges(self, pairs):
+        "Adding a batch of edges given as an array of (v1, v2) pairs"
+        v1, v2 = _pairs(pairs)
+        self.M[v1, v2] = 1
+        self.M[v2, v1] = 1
+
+    def remove_edges(self, pairs):
+        "Removing a batch of edges given as an array of (v1, v2) pairs"
+        v1, v2 = _pairs(pairs)
+        self.M[v1, v2] = 0
+        self.M[v2, v1] = 0
+
+    def has_edge(self, v1, v2):
+        return bool(self.M[v1, v2])
+
+    def neighbors(self, v):
+        "Returns the neighbors of the vertex as an array"
+        return np.flatnonzero(self.M[v])
+
+    def degree(self, v=None):
+        "Returns the degree of the vertex, or an array of degrees of all vertices"
+        if v is not None:
+            return int(np.count_nonzero(self.M[v]))
+        return np.count_nonzero(self.M, axis=1)
+
+    def print_matrix(self):
+        "printing graph adjacency matrix in a structured and readable way"
+        for row in self.M:
+            print(" ".join(str(int(edge)) for edge in row))
+
+    def reachable(self, source):
+        """
+        Returns a bool array of the vertices reachable from the source;
+        each level is the OR of the frontier's rows (a vector-matrix product)
+        """
+        seen = np.zeros(self.size, dtype=bool)
+        seen[source] = True
+        frontier = np.array([source])
+        while frontier.size:
+            reached = np.zeros(self.size, dtype=bool)
+            for i in range(0, frontier.size, _CHUNK):
+                reached |= self.M[frontier[i : i + _CHUNK]].any(axis=0)
+            frontier = np.flatnonzero(reached & ~seen)
+            seen[frontier] = True
+        return seen
+
+    def _rows(self, matrix, start, diagonal=None):
+        "Returns a block of rows as 0/1 float32 (for BLAS), optionally setting its diagonal"
+        rows = (matrix[start : start + _BLOCK] != 0).astype(np.float32)
+        if diagonal is not None:
+            i = np.arange(len(rows))
+            rows[i, start + i] = diagonal
+        return rows
+
+    def reachability(self):
+        """
+        Returns the n x n bool matrix R where R[u, v] tells if v is reachable
+        from u: R = (I + A) squared until it stops changing (log2(diameter) products).
+        R is symmetric, so block (I, J) of R @ R is R[I] @ R[J].T: only two
+        float32 blocks of _BLOCK rows are in memory besides R. Blocks are
+        updated in place (entries only grow, and stay reachable pairs)
+        """
+        r = self.M != 0
+        np.fill_diagonal(r, True)
+        n = self.size
+        changed = True
+        while changed:
+            changed = False
+            for i in range(0, n, _BLOCK):
+                rows_i = self._rows(r, i)
+                for j in range(i, n, _BLOCK):
+                    block = (rows_i @ self._rows(r, j).T) > 0
+                    if not np.array_equal(block, r[i : i + _BLOCK, j : j + _BLOCK]):
+                        changed = True
+                        r[i : i + _BLOCK, j : j + _BLOCK] = block
+                        r[j : j + _BLOCK, i : i + _BLOCK] = block.T
+        return r
+
+    def triangles(self):
+        """
+        Returns the number of triangles: trace(A^3) / 6 = sum((A @ A) * A) / 6
+        (A @ A counts the paths of length 2 between every pair of vertices).
+        A is symmetric, so block (I, J) of A @ A is A[I] @ A[J].T: only two
+        float32 blocks of _BLOCK rows are in memory, and blocks below the
+        diagonal are counted by doubling the ones above it
+        """
+        n = self.size
+        total = 0.0
+        for i in range(0, n, _BLOCK):
+            # self-loops aren't part of triangles; float32 is exact (entries <= n)
+            rows_i = self._rows(self.M, i, diagonal=0)
+            for j in range(i, n, _BLOCK):
+                paths = rows_i @ self._rows(self.M, j, diagonal=0).T
+                count = (paths * rows_i[:, j : j + _BLOCK]).sum(dtype=np.float64)
+                total += count if i == j else 2 * count
+        return int(total) // 6
+
+
+class BitGraphMatrix:
+    def __init__(self, n: int):
+        """
+        Creating an undirected graph with n vertices and a bit-packed adjacency
+        matrix: bit v of row u (bit 7 - v % 8 of byte v // 8, like np.packbits)
+        """
+        self.size = n
+        self.M = np.zeros((n, (n + 7) // 8), dtype=np.uint8)
+
+    def _set(self, v1, v2, value):
+        for a, b in ((v1, v2), (v2, v1)):
+            mask = 0x80 >> (b & 7)
+            if value:
+                self.M[a, b >> 3] |= mask
+            else:
+                self.M[a, b >> 3] &= 0xFF ^ mask
+
+    def add_edge(self, v1, v2):
+        "Adding edges to the undirected graph matrix"
+        self._set(v1, v2, 1)
+
+    def remove_edge(self, v1, v2):
+        "Removing edges from the undirected graph matrix"
+        self._set(v1, v2, 0)
+
+    def _masks(self, pairs):
+        "Returns the (rows, byte columns) and bit masks of both directions of the edges"
+        v1, v2 = _pairs(pairs)
+        rows = np.concatenate([v1, v2])
+        columns = np.concatenate([v2, v1])
+        masks = (0x80 >> (columns & 7)).astype(np.uint8)
+        return (rows, columns >> 3), masks
+
+    def add_edges(self, pairs):
+        "Adding a batch of edges given as an array of (v1, v2) pairs"
+        index, masks = self._masks(pairs)
+        # .at applies every mask, even when several edges fall in the same byte
+        np.bitwise_or.at(self.M, index, masks)
+
+    def remove_edges(self, pairs):
+        "Removing a batch of edges given as an array of (v1, v2) pairs"
+        index, masks = self._masks(pairs)
+        np.bitwise_and.at(self.M, index, ~masks)
+
+    def has_edge(self, v1, v2):
+        return bool(self.M[v1, v2 >> 3] & (0x80 >> (v2 & 7)))
+
+    def row(self, v):
+        "Returns the row of the vertex unpacked to an array of 0/1"
+        return np.unpackbits(self.M[v], count=self.size)
+
+    def neighbors(self, v):
+        "Returns the neighbors of the vertex as an array"
+        return np.flatnonzero(self.row(v))
+
+    def degree(self, v=None):
+        "Returns the degree of the vertex, or an array of degrees of all vertices"
+        if v is not None:
+            return int(_POPCOUNT[self.M[v]].sum())
+        degrees = np.empty(self.size, dtype=np.int64)
+        for i in range(0, self.size, _CHUNK):
+            degrees[i : i + _CHUNK] = _POPCOUNT[self.M[i : i + _CHUNK]].sum(axis=1)
+        return degrees
+
+    def print_matrix(self):
+        "printing graph adjacency matrix in a structured and readable way"
+        for v in range(self.size):
+            print(" ".join(str(edge) for edge in self.row(v)))
+
+    def reachable(self, source):
+        """
+        Returns a bool array of the vertices reachable from the source;
+        each level is the OR of the frontier's packed rows, 8 vertices per byte
+        """
+        seen = np.zeros(self.M.shape[1], dtype=np.uint8)
+        seen[source >> 3] = 0x80 >> (source & 7)
+        frontier = np.array([source])
+        while frontier.size:
+            reached = np.zeros_like(seen)
+            for i in range(0, frontier.size, _CHUNK):
+                reached |= np.bitwise_or.reduce(self.M[frontier[i : i + _CHUNK]], axis=0)
+            new = reached & ~seen
+            seen |= new
+            frontier = np.flatnonzero(np.unpackbits(new, count=self.size))
+        return np.unpackbits(seen, count=self.size).astype(bool)
+
+    def triangles(self):
+        """
+        Returns the number of triangles: for every edge (u, v) with u < v, the
+        common neighbors are popcount(row u AND row v); each triangle is
+        counted once for each of its 3 edges (self-loops are ignored)
+        """
+        vertices = np.arange(self.size)
+        loops = (self.M[vertices, vertices >> 3] & (0x80 >> (vertices & 7))) != 0
+        total = 0
+        for u in range(self.size):
+            higher = self.neighbors(u)
+            higher = higher[higher > u]
+            row = self.M[u].copy()
+            row[u >> 3] &= 0xFF ^ (0x80 >> (u & 7))
+            for i in range(0, higher.size, _CHUNK):
+                chunk = higher[i : i + _CHUNK]
+                common = self.M[chunk] & row
+                # a self-loop of v would count v as a common neighbor of u and v
+                total += int(_POPCOUNT[common].sum(dtype=np.int64)) - int(loops[chunk].sum())
+        return total // 3
+
+
+if __name__ == "__main__":
+    import time
+
+    for graph_class in (BoolGraphMatrix, BitGraphMatrix):
+        g = graph_class(4)
+        g.add_edges([(0, 1), (0, 2), (1, 2)])
+        g.add_edge(2, 3)
+        g.print_matrix()
+        # 0 1 1 0
+        # 1 0 1 0
+        # 1 1 0 1
+        # 0 0 1 0
+        print(g.neighbors(2), g.degree(), g.triangles())  # [0 1 3] [2 2 3 1] 1
+        g.remove_edge(0, 1)
+        print(g.reachable(3), g.triangles())  # [ True  True  True  True] 0
+        print("--------------------------------------")
+
+    n = 5000
+    rng = np.random.default_rng(0)
+    edges = rng.integers(0, n, (100_000, 2))
+    for graph_class in (BoolGraphMatrix, BitGraphMatrix):
+        t = time.perf_counter()
+        g = graph_class(n)
+        g.add_edges(edges)
+        reached = g.reachable(0).sum()
+        triangles = g.triangles()
+        print(
+            f"{graph_class.__name__:<16} {g.M.nbytes / 2**20:>6.1f}MB  "
+            f"{reached} reachable, {triangles} triangles in {time.perf_counter() - t:.2f}s"
+        )
+    print(f"{'GraphMatrix':<16} {n * n * 8 / 2**20:>6.1f}MB of pointers (lists of ints)")
@@ -1,44 +1,96 @@
 # BFS: Breadth First Search -> Queue
 # DFS: Depth First Search -> Stack
+# Both visit every vertex and edge once: O(V + E), as long as taking from the
+# queue/stack and checking visited vertices are O(1) -> a deque and a set
+# (a list's pop(0) and `in` are O(n), which makes the search O(V²)).
+# They are generators: vertices are yielded in visiting order, lazily.
+from collections import deque
 
 
-def bfs(G: dict, s: str = "0", v: list = []):
+def bfs(G: dict, s: str = "0"):
     """Searching graph(G) - which is a dictionary - starting from (s) vertex
-    including visited vertices in (v) list; using BFS method"""
-    q = []
-    v.append(s)
-    q.append(s)
+    and yielding the visited vertices; using BFS method"""
+    visited = {s}
+    q = deque([s])
     while q:
-        m = q.pop(0)
-        print(m, end=" ")
+        m = q.popleft()
+        yield m
         for n in G[m]:
-            if n not in v:
-                v.append(n)
+            if n not in visited:
+                visited.add(n)
                 q.append(n)
 
 
-g = {
-    "0": ["1", "2"],
-    "1": ["3", "4", "6"],
-    "2": ["5", "6"],
-    "3": [],
-    "4": [],
-    "5": [],
-    "6": [],
-}
+def dfs(G: dict, s: str = "0"):
+    """Searching graph(G) - which is a dictionary - starting from (s) vertex
+    and yielding the visited vertices; using DFS method. Iterative (no recursion
+    limit): the stack keeps where each vertex's neighbors were left off, so the
+    order is the same as the recursive version's"""
+    visited = {s}
+    yield s
+    stack = [iter(G[s])]
+    while stack:
+        for n in stack[-1]:
+            if n not in visited:
+                visited.add(n)
+                yield n
+                stack.append(iter(G[n]))
+                break
+        else:
+            stack.pop()
 
-bfs(g)  # 0 1 2 3 4 6 5
-print()
 
+# Integer-labelled graphs (vertices 0..n-1, G is a list of neighbor lists):
+# visited vertices are kept in a bitset (a bytearray, 1 bit per vertex), which
+# is 8 times smaller than a bytearray of flags and far smaller than a set
+# (10M vertices: 1.25MB vs ~500MB)
 
-def dfs(G: dict, s: str = "0", v: list = []):
-    """Searching graph(G) - which is a dictionary - starting from (s) vertex
-    including visited vertices in (v) list; using DFS method"""
-    if s not in v:
-        print(s, end=" ")
-        v.append(s)
-        for n in G[s]:
-            dfs(G, n, v)
 
+def bfs_bitset(G: list, s: int = 0):
+    "BFS over a list of neighbor lists with a bitset of visited vertices"
+    visited = bytearray((len(G) + 7) >> 3)
+    visited[s >> 3] |= 1 << (s & 7)
+    q = deque([s])
+    while q:
+        m = q.popleft()
+        yield m
+        for n in G[m]:
+            if not visited[n >> 3] & (1 << (n & 7)):
+                visited[n >> 3] |= 1 << (n & 7)
+                q.append(n)
+
+
+def dfs_bitset(G: list, s: int = 0):
+    "DFS over a list of neighbor lists with a bitset of visited vertices"
+    visited = bytearray((len(G) + 7) >> 3)
+    visited[s >> 3] |= 1 << (s & 7)
+    yield s
+    stack = [iter(G[s])]
+    while stack:
+        for n in stack[-1]:
+            if not visited[n >> 3] & (1 << (n & 7)):
+                visited[n >> 3] |= 1 << (n & 7)
+                yield n
+                stack.append(iter(G[n]))
+                break
+        else:
+            stack.pop()
+
+
+if __name__ == "__main__":
+    g = {
+        "0": ["1", "2"],
+        "1": ["3", "4", "6"],
+        "2": ["5", "6"],
+        "3": [],
+        "4": [],
+        "5": [],
+        "6": [],
+    }
+
+    print(*bfs(g))  # 0 1 2 3 4 6 5
+    print(*dfs(g))  # 0 1 3 4 6 2 5
 
-dfs(g)  # 0 1 3 4 6 2 5
+    h = [[1, 2], [3, 4, 6], [5, 6], [], [], [], []]
+    print(*bfs_bitset(h))  # 0 1 2 3 4 6 5
+    print(*dfs_bitset(h))  # 0 1 3 4 6 2 5
@@ -0,0 +1,65 @@
+# Benchmark: graph traversals on growing random graphs
+# usage: python graph_traverse_benchmark.py [n ...]   (e.g. 10000000 for 10M vertices)
+# Every graph is a path 0-1-...-(n-1) plus 2n random directed edges, so all n
+# vertices are reached. With a deque and a set (or bitset) the time per vertex
+# stays flat as n grows (linear scaling); the old list-based BFS (pop(0) and
+# `in` on a list) grows with n (quadratic) and is only run on small graphs.
+import random
+import sys
+import time
+
+from graph_traverse import bfs, bfs_bitset, dfs, dfs_bitset
+
+
+def list_bfs(G, s=0):
+    "The old BFS: a list as the queue and as the visited collection"
+    v = [s]
+    q = [s]
+    while q:
+        m = q.pop(0)
+        yield m
+        for n in G[m]:
+            if n not in v:
+                v.append(n)
+                q.append(n)
+
+
+def random_graph(n, extra=2):
+    "A list of neighbor lists: a path through all vertices plus extra * n random edges"
+    rng = random.Random(0)
+    G = [[i + 1] for i in range(n - 1)] + [[]]
+    for _ in range(extra * n):
+        G[rng.randrange(n)].append(rng.randrange(n))
+    return G
+
+
+def timed_count(traversal, G):
+    "Returns (number of vertices yielded, seconds)"
+    t = time.perf_counter()
+    count = sum(1 for _ in traversal(G, 0))
+    return count, time.perf_counter() - t
+
+
+def benchmark(sizes):
+    "Printing the time per vertex of every traversal for every size"
+    traversals = {
+        "bfs (set)": bfs,
+        "dfs (set)": dfs,
+        "bfs (bitset)": bfs_bitset,
+        "dfs (bitset)": dfs_bitset,
+        "bfs (list)": list_bfs,
+    }
+    print(f"{'n':>10} {'traversal':<13} {'time':>9} {'ns/vertex':>10}")
+    for n in sizes:
+        G = random_graph(n)
+        for name, traversal in traversals.items():
+            if traversal is list_bfs and n > 20_000:
+                continue
+            count, seconds = timed_count(traversal, G)
+            assert count == n
+            print(f"{n:>10} {name:<13} {seconds:>8.3f}s {seconds / n * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    benchmark(sizes)
@@ -8,94 +8,321 @@
 # right-node: 2i+2
 # node's parent: floor((i-1)/2)
 
+import operator
 
-def heapify(array: list[int], index: int):
+
+def _comparator(max_heap: bool = False, key=None):
+    """
+    Returns before(a, b) which is True when a must be above b in the heap
+    (MinHeap: smaller first, MaxHeap: bigger first, compared by key if given)
+    """
+    if key is None:
+        return operator.gt if max_heap else operator.lt
+    if max_heap:
+        return lambda a, b: key(a) > key(b)
+    return lambda a, b: key(a) < key(b)
+
+
+def sift_up(array: list, index: int, before, d: int = 2) -> None:
     """
-    Converts your heap to a MaxHeap using its array, based on the given node index
-    Compares nodes with their parents and swap them if needed
+    Moving the node at index up while it must be above its parent
+    Parents are shifted down into the "hole" and the node is written once
+    (d is the number of children per node; parent of i: (i-1)//d)
     """
-    p = int((index - 1) / 2)
-    if array[p] > 0:
-        if array[index] > array[p]:
-            array[index], array[p] = array[p], array[index]
-            heapify(array, p)
+    item = array[index]
+    while index > 0:
+        parent = (index - 1) // d
+        if not before(item, array[parent]):
+            break
+        array[index] = array[parent]
+        index = parent
+    array[index] = item
 
 
-def insert_node(array: list[int], data: int):
+def sift_down(array: list, index: int, n: int, before, d: int = 2) -> None:
+    """
+    Moving the node at index down (within array[:n]) while one of its children
+    must be above it; it is swapped with the child which must be the highest
+    (d is the number of children per node; children of i: d*i+1 ... d*i+d)
     """
-    Inserting a node into a max-heap and then heapify
+    item = array[index]
+    while True:
+        child = d * index + 1
+        if child >= n:
+            break
+        if d == 2:
+            if child + 1 < n and before(array[child + 1], array[child]):
+                child += 1
+        else:
+            for sibling in range(child + 1, min(child + d, n)):
+                if before(array[sibling], array[child]):
+                    child = sibling
+        if not before(array[child], item):
+            break
+        array[index] = array[child]
+        index = child
+    array[index] = item
+
+
+def heapify(array: list, index: int, max_heap: bool = True, key=None):
+    """
+    Converts your heap to a MaxHeap (or MinHeap) using its array,
+    based on the given node index
+    Compares nodes with their parents and moves them up if needed
+    """
+    sift_up(array, index, _comparator(max_heap, key))
+
+
+def insert_node(array: list, data, max_heap: bool = True, key=None):
+    """
+    Inserting a node into a max-heap (or min-heap) and then heapify
     Node is inserted at the end of our array
     """
     n = len(array)
     array.append(data)  # data is inserted an 'n' index
-    heapify(array, n)
+    heapify(array, n, max_heap, key)
+
+
+def extract_root(array: list, max_heap: bool = True, key=None):
+    """
+    Removing and returning the root (max/min) node of the heap
+    The last node takes its place and is sifted down
+    """
+    if not array:
+        raise IndexError("extract from an empty heap")
+    last = array.pop()
+    if not array:
+        return last
+    root = array[0]
+    array[0] = last
+    sift_down(array, 0, len(array), _comparator(max_heap, key))
+    return root
 
 
 def max_heapify(arr: list, node_index: int, current_node_index: int):
     "Converts your heap to a MaxHeap using its array"
-    largest = current_node_index
-    left_node_index = 2 * current_node_index + 1
-    right_node_index = 2 * current_node_index + 2
-    if left_node_index < node_index and arr[current_node_index] < arr[left_node_index]:
-        largest = left_node_index
+    sift_down(arr, current_node_index, node_index, operator.gt)
 
-    if right_node_index < node_index and arr[largest] < arr[right_node_index]:
-        largest = right_node_index
 
-    if largest != current_node_index:
-        arr[current_node_index], arr[largest] = arr[largest], arr[current_node_index]
-        max_heapify(arr, node_index, largest)
+def build_heap(array: list, max_heap: bool = False, key=None):
+    "Creates a MinHeap (or MaxHeap) from an array in O(n)"
+    before = _comparator(max_heap, key)
+    n = len(array)
+    # floor(n/2) - 1 gives you the last parent node index
+    for i in range(n // 2 - 1, -1, -1):
+        sift_down(array, i, n, before)
 
 
-def heap_sort(arr: list[int]):
-    "Sorts your MaxHeap array"
+def heap_sort(arr: list, key=None, reverse: bool = False):
+    "Sorts your array using a MaxHeap (MinHeap if reverse)"
+    before = _comparator(not reverse, key)
     n = len(arr)
     # Creating MaxHeap
-    # floor(n/2) - 1 gives you the last parent node index
-    for i in range(n // 2 - 1, -1, -1):
-        max_heapify(arr, n, i)
+    build_heap(arr, not reverse, key)
     # Sorting created MaxHeap
     for i in range(n - 1, 0, -1):
         arr[i], arr[0] = arr[0], arr[i]
-        max_heapify(arr, i, 0)
+        sift_down(arr, 0, i, before)
 
 
-def min_heapify(array: list[int], index: int):
+def min_heapify(array: list, index: int):
     "Converts your heap to a MinHeap using its array based on node index"
-    left_node_index = 2 * index + 1
-    right_node_index = 2 * index + 2
-    if left_node_index < len(array) and array[left_node_index] < array[index]:
-        smallest = left_node_index
-    else:
-        smallest = index
+    sift_down(array, index, len(array), operator.lt)
 
-    if right_node_index < len(array) and array[right_node_index] < array[smallest]:
-        smallest = right_node_index
 
-    if smallest != index:
-        array[index], array[smallest] = array[smallest], array[index]
-        min_heapify(array, smallest)
+def build_min_heap(array: list, key=None):
+    "Creates a MinHeap from an array"
+    build_heap(array, max_heap=False, key=key)
 
 
-def build_min_heap(array: list[int]):
-    "Creates a MinHeap from an array"
-    n = int((len(array) // 2) - 1)
-    for i in range(n, -1, -1):
-        min_heapify(array, i)
-
-
-A = [5, 6, 3, 1, 4, 2, 7]
-build_min_heap(A)
-print(A)  # [1, 4, 2, 6, 5, 3, 7]
-
-c = [45, 35, 23, 27, 21, 22, 4, 19]
-insert_node(c, 42)
-for i in range(len(c)):
-    print(c[i], end=" ")  # 45 42 23 35 21 22 4 19 27
-
-print()
-arr = [12, 11, 13, 5, 6, 7]
-heap_sort(arr)
-n = len(arr)
-for i in range(n):
-    print(arr[i], end=" ")  # 5 6 7 11 12 13
+def build_max_heap(array: list, key=None):
+    "Creates a MaxHeap from an array"
+    build_heap(array, max_heap=True, key=key)
+
+
+class DaryHeap:
+    """
+    Heap with d children per node (d = 2 is the usual binary heap)
+    A bigger d makes the tree shallower (log_d n levels) and keeps the children
+    of a node next to each other in memory: push is cheaper, pop compares
+    d children per level
+    """
+
+    def __init__(self, d: int = 2, max_heap: bool = False, key=None):
+        if d < 2:
+            raise ValueError("d must be at least 2")
+        self.d = d
+        self.max_heap = max_heap
+        self.key = key
+        self._before = _comparator(max_heap, key)
+        self._array = []
+
+    def __len__(self):
+        return len(self._array)
+
+    def peek(self):
+        "Returns the root (min/max) item"
+        if not self._array:
+            raise IndexError("peek from an empty heap")
+        return self._array[0]
+
+    def push(self, item):
+        "Inserting an item: O(log_d n)"
+        self._array.append(item)
+        sift_up(self._array, len(self._array) - 1, self._before, self.d)
+
+    def pop(self):
+        "Removing and returning the root item: O(d log_d n)"
+        array = self._array
+        if not array:
+            raise IndexError("pop from an empty heap")
+        last = array.pop()
+        if not array:
+            return last
+        root = array[0]
+        array[0] = last
+        sift_down(array, 0, len(array), self._before, self.d)
+        return root
+
+    def meld(self, other: "DaryHeap"):
+        "Moving all items of the other heap into this one: O(n + m)"
+        self._array.extend(other._array)
+        other._array = []
+        n = len(self._array)
+        for i in range((n - 2) // self.d, -1, -1):
+            sift_down(self._array, i, n, self._before, self.d)
+
+
+class PairingNode:
+    "Node of a pairing heap: its first child and its next sibling"
+
+    __slots__ = ("item", "child", "sibling")
+
+    def __init__(self, item):
+        self.item = item
+        self.child = None
+        self.sibling = None
+
+
+class PairingHeap:
+    """
+    Heap-ordered multi-way tree; two heaps are melded in O(1) by making the
+    "lower" root the first child of the other one.
+    push/meld/peek: O(1), pop: O(log n) amortised (its children are melded in
+    pairs left to right, then the pairs are melded right to left)
+    """
+
+    def __init__(self, max_heap: bool = False, key=None):
+        self.max_heap = max_heap
+        self.key = key
+        self._before = _comparator(max_heap, key)
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _link(self, a, b):
+        "Melding two trees and returning the new root"
+        if self._before(b.item, a.item):
+            a, b = b, a
+        b.sibling = a.child
+        a.child = b
+        return a
+
+    def peek(self):
+        "Returns the root (min/max) item"
+        if self._root is None:
+            raise IndexError("peek from an empty heap")
+        return self._root.item
+
+    def push(self, item):
+        "Inserting an item: O(1)"
+        node = PairingNode(item)
+        self._root = node if self._root is None else self._link(self._root, node)
+        self._size += 1
+
+    def pop(self):
+        "Removing and returning the root item: O(log n) amortised"
+        root = self._root
+        if root is None:
+            raise IndexError("pop from an empty heap")
+        # first pass: melding children in pairs from left to right
+        pairs = []
+        c = root.child
+        while c is not None:
+            a = c
+            b = c.sibling
+            if b is None:
+                a.sibling = None
+                pairs.append(a)
+                break
+            c = b.sibling
+            a.sibling = b.sibling = None
+            pairs.append(self._link(a, b))
+        # second pass: melding the pairs from right to left
+        new_root = pairs.pop() if pairs else None
+        while pairs:
+            new_root = self._link(pairs.pop(), new_root)
+        self._root = new_root
+        self._size -= 1
+        return root.item
+
+    def meld(self, other: "PairingHeap"):
+        "Moving all items of the other heap into this one: O(1)"
+        if other._root is not None:
+            if self._root is None:
+                self._root = other._root
+            else:
+                self._root = self._link(self._root, other._root)
+            self._size += other._size
+            other._root = None
+            other._size = 0
+
+
+# heap backends which share the same interface: push/pop/peek/meld/len
+HEAP_BACKENDS = {
+    "binary": lambda max_heap=False, key=None: DaryHeap(2, max_heap, key),
+    "4-ary": lambda max_heap=False, key=None: DaryHeap(4, max_heap, key),
+    "8-ary": lambda max_heap=False, key=None: DaryHeap(8, max_heap, key),
+    "pairing": PairingHeap,
+}
+
+
+def make_heap(backend: str = "binary", max_heap: bool = False, key=None):
+    "Creates an empty heap using one of HEAP_BACKENDS"
+    if backend not in HEAP_BACKENDS:
+        raise ValueError(f"unknown heap backend: {backend}")
+    return HEAP_BACKENDS[backend](max_heap=max_heap, key=key)
+
+
+if __name__ == "__main__":
+    A = [5, 6, 3, 1, 4, 2, 7]
+    build_min_heap(A)
+    print(A)  # [1, 4, 2, 6, 5, 3, 7]
+
+    c = [45, 35, 23, 27, 21, 22, 4, 19]
+    insert_node(c, 42)
+    for i in range(len(c)):
+        print(c[i], end=" ")  # 45 42 23 35 21 22 4 19 27
+
+    print()
+    arr = [12, 11, 13, 5, 6, 7]
+    heap_sort(arr)
+    n = len(arr)
+    for i in range(n):
+        print(arr[i], end=" ")  # 5 6 7 11 12 13
+
+    print()
+    d = [3, 0, -1]
+    insert_node(d, 5)  # zero or negative keys are fine too
+    print(d)  # [5, 3, -1, 0]
+    tasks = [("write", 3), ("read", 1), ("sync", 2)]
+    build_min_heap(tasks, key=lambda t: t[1])
+    print(extract_root(tasks, max_heap=False, key=lambda t: t[1]))  # ('read', 1)
+
+    for backend in HEAP_BACKENDS:
+        h = make_heap(backend)
+        for x in [5, 6, 3, 1, 4, 2, 7]:
+            h.push(x)
+        print(backend, [h.pop() for _ in range(len(h))])  # [1, 2, 3, 4, 5, 6, 7]
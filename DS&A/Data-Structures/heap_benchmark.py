@@ -0,0 +1,142 @@
+# Benchmark: heap.py engine vs heapq (C implementation of the same algorithm)
+# and heap.py backends (binary / 4-ary / 8-ary / pairing) on a mixed workload
+# usage: python heap_benchmark.py [n ...]
+# Every result is also checked against sorted(), for random ints including
+# zero and negative keys (which the old recursive heapify got wrong).
+import heapq
+import random
+import sys
+import time
+
+from heap import (
+    HEAP_BACKENDS,
+    build_min_heap,
+    extract_root,
+    heap_sort,
+    insert_node,
+    make_heap,
+)
+
+
+def timed(function, *args):
+    "Returns (result, seconds) of calling the function"
+    t = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - t
+
+
+def heap_py_push_pop(values):
+    h = []
+    for v in values:
+        insert_node(h, v, max_heap=False)
+    return [extract_root(h, max_heap=False) for _ in values]
+
+
+def heapq_push_pop(values):
+    h = []
+    for v in values:
+        heapq.heappush(h, v)
+    return [heapq.heappop(h) for _ in values]
+
+
+def heap_py_build(values):
+    a = list(values)
+    build_min_heap(a)
+    return a
+
+
+def heapq_build(values):
+    a = list(values)
+    heapq.heapify(a)
+    return a
+
+
+def heap_py_sort(values):
+    a = list(values)
+    heap_sort(a)
+    return a
+
+
+def heapq_sort(values):
+    a = list(values)
+    heapq.heapify(a)
+    return [heapq.heappop(a) for _ in values]
+
+
+def benchmark(sizes):
+    "Printing timings of both implementations for every operation and size"
+    cases = {
+        "build": (heap_py_build, heapq_build),
+        "push+pop": (heap_py_push_pop, heapq_push_pop),
+        "sort": (heap_py_sort, heapq_sort),
+    }
+    print(f"{'n':>9} {'operation':<10} {'heap.py':>9} {'heapq':>9} {'ratio':>7}")
+    for n in sizes:
+        values = [random.randint(-n, n) for _ in range(n)]
+        expected = sorted(values)
+        for name, (ours, theirs) in cases.items():
+            result, ours_time = timed(ours, values)
+            _, theirs_time = timed(theirs, values)
+            if name == "build":
+                assert result[0] == expected[0] and sorted(result) == expected
+            else:
+                assert result == expected
+            ratio = ours_time / theirs_time if theirs_time else float("inf")
+            print(f"{n:>9} {name:<10} {ours_time:>8.3f}s {theirs_time:>8.3f}s {ratio:>6.1f}x")
+
+
+def mixed_workload(heap, values, ops):
+    """
+    Filling the heap with values, then running ops random push/pop operations
+    (pushes are a bit more likely, like a growing scheduler) and draining it
+    """
+    for v in values:
+        heap.push(v)
+    rng = random.Random(0)
+    for _ in range(ops):
+        if rng.random() < 0.55 or not len(heap):
+            heap.push(rng.randrange(len(values)))
+        else:
+            heap.pop()
+    last = None
+    while len(heap):
+        v = heap.pop()
+        assert last is None or last <= v
+        last = v
+
+
+class HeapqHeap:
+    "heapq behind the backends' interface (as a baseline)"
+
+    def __init__(self):
+        self._array = []
+
+    def __len__(self):
+        return len(self._array)
+
+    def push(self, item):
+        heapq.heappush(self._array, item)
+
+    def pop(self):
+        return heapq.heappop(self._array)
+
+
+def benchmark_backends(sizes):
+    "Printing timings of the mixed workload for every heap backend (and heapq)"
+    print(f"{'n':>9} " + " ".join(f"{name:>9}" for name in [*HEAP_BACKENDS, "heapq"]))
+    for n in sizes:
+        values = [random.randrange(n) for _ in range(n)]
+        timings = []
+        for backend in HEAP_BACKENDS:
+            _, seconds = timed(mixed_workload, make_heap(backend), values, n)
+            timings.append(seconds)
+        _, seconds = timed(mixed_workload, HeapqHeap(), values, n)
+        timings.append(seconds)
+        print(f"{n:>9} " + " ".join(f"{t:>8.3f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    benchmark(sizes)
+    print()
+    benchmark_backends(sizes)
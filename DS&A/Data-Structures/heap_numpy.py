@@ -0,0 +1,253 @@
+# Heap over NumPy typed arrays (requires numpy)
+# Same layout as heap.py (children of i: 2i+1 & 2i+2, parent: (i-1)//2) but the
+# heavy operations are vectorised, so they run in C over whole levels at once:
+# - build: nodes of the same level are roots of disjoint sub-trees, so all of
+#   them are sifted down together, level by level from the bottom (O(n) work)
+# - push_many: only the ancestors of the new leaves are sifted down again
+# - pop_many / top-k: selection with (arg)partition instead of k pops
+import numpy as np
+
+
+def _sift_down_nodes(array, n, nodes, before):
+    """
+    Sifting down all given nodes at once in array[:n]
+    nodes must be on the same level (their sub-trees are disjoint);
+    before(a, b) is True when a must be above b (np.less for a MinHeap)
+    """
+    while nodes.size:
+        left = 2 * nodes + 1
+        has_left = left < n
+        nodes, left = nodes[has_left], left[has_left]
+        child = left.copy()
+        has_right = left + 1 < n
+        right = left[has_right] + 1
+        better = before(array[right], array[left[has_right]])
+        child[np.flatnonzero(has_right)[better]] = right[better]
+        swap = before(array[child], array[nodes])
+        nodes, child = nodes[swap], child[swap]
+        parents = array[nodes]
+        array[nodes] = array[child]
+        array[child] = parents
+        nodes = child
+
+
+def _build(array, n, before):
+    "Heapifying array[:n] bottom-up, one level at a time"
+    if n < 2:
+        return
+    last_parent = n // 2 - 1
+    level_start = (1 << (int(last_parent + 1).bit_length() - 1)) - 1
+    while level_start >= 0:
+        level_end = min(2 * level_start + 1, last_parent + 1)
+        _sift_down_nodes(array, n, np.arange(level_start, level_end), before)
+        level_start = (level_start - 1) // 2 if level_start else -1
+
+
+def build_min_heap(array):
+    "Converts a NumPy array to a MinHeap in place (vectorised)"
+    _build(array, len(array), np.less)
+
+
+def build_max_heap(array):
+    "Converts a NumPy array to a MaxHeap in place (vectorised)"
+    _build(array, len(array), np.greater)
+
+
+def heap_sort(array):
+    "Sorts a NumPy array in place using NumPy's own (C) heap sort"
+    array.sort(kind="heapsort")
+
+
+def nsmallest(array, k):
+    "Returns the k smallest values in ascending order in O(n + k log k)"
+    k = min(k, len(array))
+    if k <= 0:
+        return array[:0].copy()
+    return np.sort(np.partition(array, k - 1)[:k])
+
+
+def nlargest(array, k):
+    "Returns the k largest values in descending order in O(n + k log k)"
+    k = min(k, len(array))
+    if k <= 0:
+        return array[:0].copy()
+    n = len(array)
+    return np.sort(np.partition(array, n - k)[n - k :])[::-1]
+
+
+class ArrayHeap:
+    """
+    Min (or max) heap stored in a growable NumPy array of the given dtype
+    Single push/pop are O(log n) like heap.py; batched operations are vectorised
+    """
+
+    def __init__(self, values=None, dtype=np.int64, order="min"):
+        if order not in ("min", "max"):
+            raise ValueError("order must be 'min' or 'max'")
+        self.order = order
+        self._before = np.less if order == "min" else np.greater
+        values = np.asarray(values if values is not None else [], dtype=dtype)
+        self._array = np.array(values, dtype=dtype)  # a copy which is heapified
+        self._n = len(values)
+        _build(self._array, self._n, self._before)
+
+    def __len__(self):
+        return self._n
+
+    def values(self):
+        "Returns a read-only view of the heap array (in heap order)"
+        view = self._array[: self._n]
+        view.flags.writeable = False
+        return view
+
+    def _reserve(self, size):
+        "Growing the buffer geometrically so that it has room for size values"
+        if size > len(self._array):
+            grown = np.empty(max(size, 2 * len(self._array), 8), dtype=self._array.dtype)
+            grown[: self._n] = self._array[: self._n]
+            self._array = grown
+
+    def peek(self):
+        "Returns the root (min/max) value"
+        if not self._n:
+            raise IndexError("peek from an empty heap")
+        return self._array[0]
+
+    def push(self, value):
+        "Inserting a value at the end and sifting it up"
+        self._reserve(self._n + 1)
+        a, before = self._array, self._before
+        i = self._n
+        a[i] = value
+        self._n += 1
+        value = a[i]
+        while i > 0:
+            p = (i - 1) // 2
+            if not before(value, a[p]):
+                break
+            a[i] = a[p]
+            i = p
+        a[i] = value
+
+    def push_many(self, values):
+        """
+        Inserting a batch of values; the new leaves are appended and only their
+        ancestors are sifted down again, level by level from the bottom
+        """
+        values = np.asarray(values, dtype=self._array.dtype)
+        k = len(values)
+        if not k:
+            return
+        start = self._n
+        self._reserve(start + k)
+        self._array[start : start + k] = values
+        self._n += k
+        if k >= start:
+            # the batch is at least as big as the heap: rebuilding is cheaper
+            _build(self._array, self._n, self._before)
+            return
+        dirty = []
+        nodes = np.arange(start, start + k)
+        while nodes.size and nodes[0] > 0:
+            nodes = np.unique((nodes[nodes > 0] - 1) // 2)
+            dirty.append(nodes)
+        dirty = np.unique(np.concatenate(dirty))
+        depths = np.floor(np.log2(dirty + 1)).astype(np.int64)
+        for depth in range(int(depths.max()), -1, -1):
+            _sift_down_nodes(self._array, self._n, dirty[depths == depth], self._before)
+
+    def pop(self):
+        "Removing and returning the root value"
+        if not self._n:
+            raise IndexError("pop from an empty heap")
+        a, before = self._array, self._before
+        root = a[0].copy()
+        self._n -= 1
+        n = self._n
+        value = a[n]
+        i = 0
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and before(a[child + 1], a[child]):
+                child += 1
+            if not before(a[child], value):
+                break
+            a[i] = a[child]
+            i = child
+        if n:
+            a[i] = value
+        return root
+
+    def _top_positions(self, k):
+        "Returns positions of the k values closest to the root in sorted order"
+        view = self._array[: self._n]
+        # the k smallest (largest) values of a heap are all within its first k levels
+        view = view[: min(self._n, (1 << min(k, 62)) - 1)]
+        if self.order == "min":
+            positions = np.argpartition(view, k - 1)[:k]
+            return positions[np.argsort(view[positions], kind="stable")]
+        positions = np.argpartition(view, len(view) - k)[len(view) - k :]
+        return positions[np.argsort(view[positions], kind="stable")[::-1]]
+
+    def pop_many(self, k):
+        """
+        Removing and returning the k root-most values in pop order
+        Small batches are popped one by one, big ones are selected with
+        argpartition and the rest of the heap is rebuilt in O(n)
+        """
+        k = min(k, self._n)
+        if k <= 0:
+            return self._array[:0].copy()
+        if k * int(self._n).bit_length() < self._n:
+            return np.array([self.pop() for _ in range(k)], dtype=self._array.dtype)
+        positions = self._top_positions(k)
+        result = self._array[positions]
+        keep = np.ones(self._n, dtype=bool)
+        keep[positions] = False
+        rest = self._array[: self._n][keep]
+        self._n = len(rest)
+        self._array[: self._n] = rest
+        _build(self._array, self._n, self._before)
+        return result
+
+    def nsmallest(self, k):
+        "Returns the k smallest values in ascending order without removing them"
+        if self.order == "min":
+            k = min(k, self._n)
+            return self._array[self._top_positions(k)] if k > 0 else self._array[:0].copy()
+        return nsmallest(self._array[: self._n], k)
+
+    def nlargest(self, k):
+        "Returns the k largest values in descending order without removing them"
+        if self.order == "max":
+            k = min(k, self._n)
+            return self._array[self._top_positions(k)] if k > 0 else self._array[:0].copy()
+        return nlargest(self._array[: self._n], k)
+
+
+if __name__ == "__main__":
+    import time
+
+    A = np.array([5, 6, 3, 1, 4, 2, 7])
+    build_min_heap(A)
+    print(A)  # [1 4 2 6 5 3 7]
+
+    arr = np.array([12, 11, 13, 5, 6, 7])
+    heap_sort(arr)
+    print(arr)  # [ 5  6  7 11 12 13]
+
+    h = ArrayHeap([45, 35, 23, 27, 21, 22, 4, 19], order="max")
+    h.push(42)
+    h.push_many([50, -3, 0])
+    print(h.pop_many(3))  # [50 45 42]
+    print(h.nsmallest(2), h.nlargest(2))  # [-3  0] [35 27]
+
+    metrics = np.random.default_rng(0).integers(0, 10**9, 10_000_000, dtype=np.int64)
+    t = time.perf_counter()
+    h = ArrayHeap(metrics)
+    print(f"built a heap of {len(h)} int64 in {time.perf_counter() - t:.2f}s")
+    t = time.perf_counter()
+    h.push_many(metrics[:100_000])
+    print(f"pushed 100000 more in {time.perf_counter() - t:.2f}s")
@@ -0,0 +1,198 @@
+# Randomized property tests of heap.py
+# usage: python heap_test.py (or pytest)
+# Every case runs on many random arrays of ints including zero and negative
+# keys, duplicates, empty and single-item arrays; a failure prints its trial number.
+import operator
+import random
+import unittest
+
+from heap import (
+    HEAP_BACKENDS,
+    DaryHeap,
+    build_heap,
+    build_max_heap,
+    build_min_heap,
+    extract_root,
+    heap_sort,
+    insert_node,
+    make_heap,
+    max_heapify,
+    min_heapify,
+    sift_down,
+    sift_up,
+)
+
+TRIALS = 300
+
+
+def random_arrays(seed=0):
+    "Yielding (trial, array) pairs of random sizes and value ranges"
+    for trial in range(TRIALS):
+        rng = random.Random(seed * TRIALS + trial)
+        n = rng.choice([0, 1, 2, 3, rng.randrange(100)])
+        bound = rng.choice([1, 5, 1000])
+        yield trial, [rng.randint(-bound, bound) for _ in range(n)]
+
+
+def is_heap(array, before, d=2, n=None):
+    "True if no node of array[:n] must be above its parent"
+    n = len(array) if n is None else n
+    return all(not before(array[i], array[(i - 1) // d]) for i in range(1, n))
+
+
+class SiftTest(unittest.TestCase):
+    def test_sift_up_restores_heap(self):
+        for d in (2, 3, 4, 8):
+            for before in (operator.lt, operator.gt):
+                for trial, array in random_arrays(d):
+                    heap = sorted(array, reverse=before is operator.gt)  # already a heap
+                    heap.append(random.Random(trial).randint(-10, 10))
+                    expected = sorted(heap)
+                    sift_up(heap, len(heap) - 1, before, d)
+                    self.assertTrue(is_heap(heap, before, d), (d, trial))
+                    self.assertEqual(sorted(heap), expected, (d, trial))
+
+    def test_sift_down_restores_heap(self):
+        for d in (2, 3, 4, 8):
+            for before in (operator.lt, operator.gt):
+                for trial, array in random_arrays(d):
+                    if not array:
+                        continue
+                    heap = sorted(array, reverse=before is operator.gt)
+                    heap[0] = random.Random(trial).randint(-2000, 2000)  # a new root
+                    expected = sorted(heap)
+                    sift_down(heap, 0, len(heap), before, d)
+                    self.assertTrue(is_heap(heap, before, d), (d, trial))
+                    self.assertEqual(sorted(heap), expected, (d, trial))
+
+    def test_sift_down_stays_within_n(self):
+        for trial, array in random_arrays(1):
+            if len(array) < 2:
+                continue
+            n = len(array) // 2
+            heap, rest = array[:n], array[n:]
+            build_min_heap(heap)
+            heap[0] = max(array) + 1
+            heap += rest
+            sift_down(heap, 0, n, operator.lt)
+            self.assertTrue(is_heap(heap, operator.lt, n=n), trial)
+            self.assertEqual(heap[n:], rest, trial)
+
+
+class BuildTest(unittest.TestCase):
+    def test_build_min_and_max_heap(self):
+        for trial, array in random_arrays(2):
+            heap = list(array)
+            build_min_heap(heap)
+            self.assertTrue(is_heap(heap, operator.lt), trial)
+            self.assertEqual(sorted(heap), sorted(array), trial)
+            heap = list(array)
+            build_max_heap(heap)
+            self.assertTrue(is_heap(heap, operator.gt), trial)
+            self.assertEqual(sorted(heap), sorted(array), trial)
+
+    def test_build_with_key(self):
+        for trial, array in random_arrays(3):
+            items = [(abs(x), i) for i, x in enumerate(array)]
+            key = operator.itemgetter(0)
+            build_heap(items, max_heap=False, key=key)
+            self.assertTrue(is_heap(items, lambda a, b: a[0] < b[0]), trial)
+            build_heap(items, max_heap=True, key=key)
+            self.assertTrue(is_heap(items, lambda a, b: a[0] > b[0]), trial)
+
+    def test_max_and_min_heapify(self):
+        for trial, array in random_arrays(4):
+            heap = list(array)
+            for i in range(len(heap) // 2 - 1, -1, -1):
+                max_heapify(heap, len(heap), i)
+            self.assertTrue(is_heap(heap, operator.gt), trial)
+            heap = list(array)
+            for i in range(len(heap) // 2 - 1, -1, -1):
+                min_heapify(heap, i)
+            self.assertTrue(is_heap(heap, operator.lt), trial)
+
+
+class InsertExtractTest(unittest.TestCase):
+    def test_insert_then_extract_is_sorted(self):
+        for max_heap in (False, True):
+            for trial, array in random_arrays(5):
+                heap = []
+                for x in array:
+                    insert_node(heap, x, max_heap=max_heap)
+                    self.assertTrue(is_heap(heap, operator.gt if max_heap else operator.lt), trial)
+                popped = [extract_root(heap, max_heap=max_heap) for _ in array]
+                self.assertEqual(popped, sorted(array, reverse=max_heap), trial)
+                self.assertEqual(heap, [])
+
+    def test_insert_with_key(self):
+        for trial, array in random_arrays(6):
+            heap = []
+            for x in array:
+                insert_node(heap, x, max_heap=False, key=abs)
+            popped = [abs(extract_root(heap, max_heap=False, key=abs)) for _ in array]
+            self.assertEqual(popped, sorted(abs(x) for x in array), trial)
+
+    def test_extract_from_empty_heap(self):
+        with self.assertRaises(IndexError):
+            extract_root([])
+
+
+class HeapSortTest(unittest.TestCase):
+    def test_heap_sort_matches_sorted(self):
+        for trial, array in random_arrays(7):
+            result = list(array)
+            heap_sort(result)
+            self.assertEqual(result, sorted(array), trial)
+            result = list(array)
+            heap_sort(result, reverse=True)
+            self.assertEqual(result, sorted(array, reverse=True), trial)
+
+    def test_heap_sort_with_key(self):
+        for trial, array in random_arrays(8):
+            result = list(array)
+            heap_sort(result, key=abs)
+            self.assertEqual([abs(x) for x in result], sorted(abs(x) for x in array), trial)
+
+
+class BackendTest(unittest.TestCase):
+    def test_backends_pop_in_order(self):
+        for backend in HEAP_BACKENDS:
+            for max_heap in (False, True):
+                for trial, array in random_arrays(9):
+                    h = make_heap(backend, max_heap=max_heap)
+                    for x in array:
+                        h.push(x)
+                    self.assertEqual(len(h), len(array))
+                    popped = [h.pop() for _ in array]
+                    self.assertEqual(popped, sorted(array, reverse=max_heap), (backend, trial))
+
+    def test_backends_mixed_push_pop_and_meld(self):
+        for backend in HEAP_BACKENDS:
+            for trial, array in random_arrays(10):
+                rng = random.Random(trial)
+                h, other, model, extra = make_heap(backend), make_heap(backend), [], []
+                for x in array:
+                    if rng.random() < 0.3 and model:
+                        self.assertEqual(h.peek(), min(model), (backend, trial))
+                        model.remove(h.pop())
+                    elif rng.random() < 0.5:
+                        h.push(x)
+                        model.append(x)
+                    else:
+                        other.push(x)
+                        extra.append(x)
+                h.meld(other)
+                self.assertEqual(len(other), 0)
+                self.assertEqual([h.pop() for _ in range(len(h))], sorted(model + extra))
+
+    def test_dary_heap_rejects_unary(self):
+        with self.assertRaises(ValueError):
+            DaryHeap(1)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            make_heap("fibonacci")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -46,10 +46,147 @@ class Queue:
             self.queue[self.rear] = data
 
 
+class Deque:
+    """
+    Growable double-ended queue over a circular buffer (replaces the fixed Queue):
+    front/rear wrap around with a mask (capacity is a power of two), the buffer
+    doubles when full and halves when a quarter full, so push/pop at both ends
+    are O(1) amortised and indexing is O(1)
+    """
+
+    MIN_CAPACITY = 8
+
+    def __init__(self, iterable=()):
+        self._buffer = [None] * self.MIN_CAPACITY
+        self._mask = self.MIN_CAPACITY - 1
+        self._front = 0  # index of the first member in the buffer
+        self._size = 0
+        self.extend(iterable)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        front, size, capacity = self._front, self._size, len(self._buffer)
+        if front + size <= capacity:
+            return iter(self._buffer[front : front + size])
+        return iter(self._buffer[front:] + self._buffer[: front + size - capacity])
+
+    def __repr__(self):
+        return f"Deque({list(self)})"
+
+    def _resize(self, capacity):
+        "Moving the members to a new buffer of the given capacity, starting at 0"
+        members = list(self)
+        self._buffer = members + [None] * (capacity - self._size)
+        self._mask = capacity - 1
+        self._front = 0
+
+    def _reserve(self, size):
+        "Growing the buffer geometrically so that it has room for size members"
+        capacity = len(self._buffer)
+        if size > capacity:
+            while capacity < size:
+                capacity *= 2
+            self._resize(capacity)
+
+    def _shrink(self):
+        capacity = len(self._buffer)
+        if capacity > self.MIN_CAPACITY and self._size <= capacity // 4:
+            self._resize(capacity // 2)
+
+    def _index(self, index):
+        "Converting a (possibly negative) index to a buffer position"
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("deque index out of range")
+        return (self._front + index) & self._mask
+
+    def __getitem__(self, index):
+        return self._buffer[self._index(index)]
+
+    def __setitem__(self, index, data):
+        self._buffer[self._index(index)] = data
+
+    def append(self, data):
+        "Adding new member to the end (rear) of the queue"
+        self._reserve(self._size + 1)
+        self._buffer[(self._front + self._size) & self._mask] = data
+        self._size += 1
+
+    def appendleft(self, data):
+        "Adding new member to the front of the queue"
+        self._reserve(self._size + 1)
+        self._front = (self._front - 1) & self._mask
+        self._buffer[self._front] = data
+        self._size += 1
+
+    def pop(self):
+        "Removing and returning the rear member of the queue"
+        if not self._size:
+            raise IndexError("pop from an empty deque")
+        self._size -= 1
+        i = (self._front + self._size) & self._mask
+        data = self._buffer[i]
+        self._buffer[i] = None  # not keeping a reference to the removed member
+        self._shrink()
+        return data
+
+    def popleft(self):
+        "Removing and returning the front member of the queue"
+        if not self._size:
+            raise IndexError("pop from an empty deque")
+        data = self._buffer[self._front]
+        self._buffer[self._front] = None
+        self._front = (self._front + 1) & self._mask
+        self._size -= 1
+        self._shrink()
+        return data
+
+    def extend(self, iterable):
+        "Adding all members of the iterable to the end, copying at most two slices"
+        members = list(iterable)
+        n = len(members)
+        if not n:
+            return
+        self._reserve(self._size + n)
+        capacity = len(self._buffer)
+        start = (self._front + self._size) & self._mask
+        first = min(n, capacity - start)
+        self._buffer[start : start + first] = members[:first]
+        self._buffer[: n - first] = members[first:]
+        self._size += n
+
+    def extendleft(self, iterable):
+        "Adding all members of the iterable to the front (ending up in reverse order)"
+        for data in iterable:
+            self.appendleft(data)
+
+    # Queue interface
+    enqueue = append
+    dequeue = popleft
+
+    def display(self):
+        "Outputting the current status of queue"
+        if not self._size:
+            print("Queue is empty!")
+        for data in self:
+            print(data, end=" ")
+
+
 # just a simple example:
-q = Queue(3)
-q.display()
-q.enqueue("a")
-q.enqueue("b")
-q.enqueue("c")
-q.display()
+if __name__ == "__main__":
+    q = Queue(3)
+    q.display()
+    q.enqueue("a")
+    q.enqueue("b")
+    q.enqueue("c")
+    q.display()
+    print()
+
+    d = Deque("abc")
+    d.appendleft("z")
+    d.extend(range(3))
+    print(d.popleft(), d.pop(), d[0], d[-1], len(d))  # z 2 a 1 5
+    d.display()  # a b c 0 1
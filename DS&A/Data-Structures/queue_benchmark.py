@@ -0,0 +1,75 @@
+# Benchmark: Deque (queue.py) vs collections.deque vs a list used as a queue
+# usage: python queue_benchmark.py [n ...]
+# list.pop(0) shifts every remaining member, so draining a list queue is O(n^2);
+# Deque and collections.deque pop from the front in O(1).
+import collections
+import sys
+import time
+
+from queue import Deque
+
+
+def timed(function, *args):
+    "Returns (result, seconds) of calling the function"
+    t = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - t
+
+
+def fifo(queue, n, pop_front):
+    "Enqueuing n members one by one, then dequeuing all of them"
+    for i in range(n):
+        queue.append(i)
+    return [pop_front(queue) for _ in range(n)]
+
+
+def sliding_window(queue, n, pop_front, window=1_000):
+    "Keeping the last `window` members of a stream of n (a bounded FIFO buffer)"
+    for i in range(n):
+        queue.append(i)
+        if len(queue) > window:
+            pop_front(queue)
+    return len(queue)
+
+
+def both_ends(queue, n, appendleft):
+    "Pushing n members to the front, reading the middle, popping from the back"
+    for i in range(n):
+        appendleft(queue, i)
+    middle = queue[n // 2]
+    return middle, [queue.pop() for _ in range(n)]
+
+
+def benchmark(sizes):
+    "Printing timings of every workload for every queue and size"
+    implementations = {
+        "Deque": (Deque, Deque.popleft, Deque.appendleft),
+        "collections.deque": (
+            collections.deque,
+            collections.deque.popleft,
+            collections.deque.appendleft,
+        ),
+        "list": (list, lambda q: q.pop(0), lambda q, x: q.insert(0, x)),
+    }
+    names = list(implementations)
+    print(f"{'n':>9} {'workload':<15} " + " ".join(f"{name:>18}" for name in names))
+    for n in sizes:
+        expected = {}
+        for workload in ("fifo", "sliding window", "both ends"):
+            timings = []
+            for name in names:
+                make, pop_front, appendleft = implementations[name]
+                if workload == "fifo":
+                    result, seconds = timed(fifo, make(), n, pop_front)
+                elif workload == "sliding window":
+                    result, seconds = timed(sliding_window, make(), n, pop_front)
+                else:
+                    result, seconds = timed(both_ends, make(), n, appendleft)
+                assert expected.setdefault(workload, result) == result
+                timings.append(seconds)
+            print(f"{n:>9} {workload:<15} " + " ".join(f"{t:>17.3f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    benchmark(sizes)
@@ -14,8 +14,20 @@ class SinglyLinkedList:
     next points to the next node after current node"""
 
     def __init__(self):
-        "starting our linked list and considering a head for the starting point"
+        """starting our linked list and considering a head for the starting point;
+        tail (last node) and size are kept too, so appending and len() are O(1)"""
         self.head = None
+        self.tail = None
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        t = self.head
+        while t is not None:
+            yield t.data
+            t = t.next
 
     def display(self):
         "Displaying all of the nodes' values in our linked list"
@@ -31,18 +43,42 @@ class SinglyLinkedList:
         n = Node(new_data)
         n.next = self.head
         self.head = n
+        if self.tail is None:
+            self.tail = n
+        self.size += 1
 
     def in_end(self, new_data):
         """Adding a node to the end of our linked list and telling the
-        previous last node where its next node is"""
+        previous last node (tail) where its next node is: O(1)"""
         n = Node(new_data)
         if self.head is None:
             self.head = n
+        else:
+            self.tail.next = n
+        self.tail = n
+        self.size += 1
+
+    def extend(self, iterable):
+        """Adding all values of the iterable to the end; the new nodes are
+        linked to each other first and then attached to the tail in one step"""
+        first = last = None
+        count = 0
+        for data in iterable:
+            n = Node(data)
+            if first is None:
+                first = n
+            else:
+                last.next = n
+            last = n
+            count += 1
+        if first is None:
             return
-        t = self.head
-        while t.next:
-            t = t.next
-        t.next = n
+        if self.head is None:
+            self.head = first
+        else:
+            self.tail.next = first
+        self.tail = last
+        self.size += count
 
     def in_after(self, node, new_data):
         """Adding a node after a specified node in our linked list"""
@@ -53,14 +89,27 @@ class SinglyLinkedList:
             return
         n.next = node.next
         node.next = n
+        if node is self.tail:
+            self.tail = n
+        self.size += 1
+
+    def pop_front(self):
+        "Removing the first node and returning its value: O(1)"
+        if self.head is None:
+            raise IndexError("pop from an empty linked list")
+        t = self.head
+        self.head = t.next
+        if self.head is None:
+            self.tail = None
+        self.size -= 1
+        return t.data
 
     def remove_node(self, d):
         """Removing the desired node from the linked list"""
         t = self.head
         if t is not None:
             if t.data == d:
-                self.head = t.next
-                t = None
+                self.pop_front()
                 return
         while t is not None:
             if t.data == d:
@@ -70,16 +119,15 @@ class SinglyLinkedList:
         if t == None:
             return
         p.next = t.next
+        if t is self.tail:
+            self.tail = p
+        self.size -= 1
         t = None
 
 
-# x = Node(3)
-# y = Node(4)
-# z = Node(5)
 # l = SinglyLinkedList()
-# l.head = x
-# x.next = y
-# y.next = z
+# l.extend([3, 4, 5])
+# z = l.tail
 
 # l.in_start(2)
 # l.in_end(7)
@@ -89,3 +137,6 @@ class SinglyLinkedList:
 # 2 -> 3 -> 4 -> 4.5 -> 5 -> 6 -> 7 -> Null
 # l.remove_node(4.5)
 # l.display()
+# 2 -> 3 -> 4 -> 5 -> 6 -> 7 -> Null
+# print(len(l), l.pop_front(), list(l))
+# 6 2 [3, 4, 5, 6, 7]
@@ -0,0 +1,192 @@
+# Skip List (ordered map)
+# A sorted linked list with extra "express lanes": every node is on level 0 and
+# on each level above with probability P, so each level skips ~1/P nodes of the
+# level below. A search starts on the top level of the head and moves down a
+# level whenever the next key is too big: O(log n) expected steps.
+# Each link also stores its width (how many positions it skips), so the
+# position (rank) of a key and the key at a position are found the same way.
+#
+# Readers don't need a lock: writers (serialised by a lock) only change links
+# with single assignments which are atomic in CPython, a new node is fully
+# built before it is linked (bottom level first) and a removed node keeps its
+# links, so a concurrent search/range sees every key that was there all along.
+# Only widths (rank/select) may be off by one while a write is in progress.
+import random
+import threading
+
+
+class SkipNode:
+    "Nodes hold a key, its value and one link (and width) per level"
+
+    __slots__ = ("key", "value", "next", "width")
+
+    def __init__(self, key, value, level):
+        self.key = key
+        self.value = value
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class SkipList:
+    """Ordered map with O(log n) expected insert/delete/search/rank/select;
+    iterating (or a range of keys) is a walk on the bottom level"""
+
+    MAX_LEVEL = 32
+    P = 0.25
+
+    def __init__(self, items=(), seed=None):
+        self.head = SkipNode(None, None, self.MAX_LEVEL)
+        self.level = 1  # number of levels in use
+        self.size = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        for key, value in items:
+            self.insert(key, value)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        "Lazily yielding all keys in ascending order"
+        x = self.head.next[0]
+        while x is not None:
+            yield x.key
+            x = x.next[0]
+
+    def items(self):
+        "Lazily yielding all (key, value) pairs in ascending order of keys"
+        x = self.head.next[0]
+        while x is not None:
+            yield x.key, x.value
+            x = x.next[0]
+
+    def _random_level(self):
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < self.P:
+            level += 1
+        return level
+
+    def _find(self, key):
+        "Returns the last node with a smaller key than the given key"
+        x = self.head
+        for i in range(self.level - 1, -1, -1):
+            nxt = x.next[i]
+            while nxt is not None and nxt.key < key:
+                x = nxt
+                nxt = x.next[i]
+        return x
+
+    def search(self, key):
+        "Returns True if the key exists"
+        x = self._find(key).next[0]
+        return x is not None and x.key == key
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def get(self, key, default=None):
+        "Returns the value of the key (default if it doesn't exist)"
+        x = self._find(key).next[0]
+        return x.value if x is not None and x.key == key else default
+
+    def insert(self, key, value=None):
+        """Inserting the key with the value (replacing the value of an existing key);
+        returns False if the key already existed"""
+        with self._lock:
+            update = [self.head] * self.MAX_LEVEL
+            rank = [0] * self.MAX_LEVEL  # positions of the update nodes (head is 0)
+            x = self.head
+            r = 0
+            for i in range(self.level - 1, -1, -1):
+                while x.next[i] is not None and x.next[i].key < key:
+                    r += x.width[i]
+                    x = x.next[i]
+                update[i] = x
+                rank[i] = r
+            x = x.next[0]
+            if x is not None and x.key == key:
+                x.value = value
+                return False
+            level = self._random_level()
+            node = SkipNode(key, value, level)
+            for i in range(level):
+                prev = update[i]
+                node.next[i] = prev.next[i]
+                # prev's link skipped width[i] positions; the new node is at r + 1
+                node.width[i] = rank[i] + prev.width[i] - r
+            for i in range(level):
+                # publishing the node from the bottom level up
+                update[i].width[i] = r + 1 - rank[i]
+                update[i].next[i] = node
+            for i in range(level, self.level):
+                update[i].width[i] += 1
+            self.level = max(self.level, level)
+            self.size += 1
+            return True
+
+    def delete(self, key):
+        "Deleting the key; returns False if it doesn't exist"
+        with self._lock:
+            update = [self.head] * self.MAX_LEVEL
+            x = self.head
+            for i in range(self.level - 1, -1, -1):
+                while x.next[i] is not None and x.next[i].key < key:
+                    x = x.next[i]
+                update[i] = x
+            x = x.next[0]
+            if x is None or x.key != key:
+                return False
+            # unlinking from the top level down; x keeps its own links
+            for i in range(self.level - 1, -1, -1):
+                if update[i].next[i] is x:
+                    update[i].width[i] += x.width[i] - 1
+                    update[i].next[i] = x.next[i]
+                else:
+                    update[i].width[i] -= 1
+            while self.level > 1 and self.head.next[self.level - 1] is None:
+                self.level -= 1
+            self.size -= 1
+            return True
+
+    def rank(self, key):
+        "Returns the number of keys smaller than the given key"
+        x = self.head
+        r = 0
+        for i in range(self.level - 1, -1, -1):
+            while x.next[i] is not None and x.next[i].key < key:
+                r += x.width[i]
+                x = x.next[i]
+        return r
+
+    def select(self, k):
+        """Returns the k-th smallest (key, value) (k starts from 0)
+        Raises IndexError if k is out of range"""
+        if k < 0 or k >= self.size:
+            raise IndexError("select index out of range")
+        x = self.head
+        r = 0
+        for i in range(self.level - 1, -1, -1):
+            while x.next[i] is not None and r + x.width[i] <= k + 1:
+                r += x.width[i]
+                x = x.next[i]
+        return x.key, x.value
+
+    def range(self, lo, hi):
+        """Lazily yielding (key, value) pairs of the closed range [lo, hi]
+        in ascending order; finding lo is O(log n), then the bottom level is walked"""
+        x = self._find(lo).next[0]
+        while x is not None and x.key <= hi:
+            yield x.key, x.value
+            x = x.next[0]
+
+
+if __name__ == "__main__":
+    s = SkipList(seed=0)
+    for k in [30, 10, 50, 20, 40]:
+        s.insert(k, str(k))
+    s.insert(20, "twenty")
+    print(list(s), len(s))  # [10, 20, 30, 40, 50] 5
+    print(s.get(20), 25 in s, s.rank(35), s.select(0))  # twenty False 3 (10, '10')
+    print(list(s.range(15, 40)))  # [(20, 'twenty'), (30, '30'), (40, '40')]
+    s.delete(30)
+    print(list(s), s.rank(50), s.select(3))  # [10, 20, 40, 50] 3 (50, '50')
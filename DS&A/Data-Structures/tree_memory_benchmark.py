@@ -0,0 +1,69 @@
+# Memory benchmark: bytes per node of the tree layouts
+# usage: python tree_memory_benchmark.py [n]
+# - dict node: a plain class whose attributes live in a per-instance __dict__
+# - __slots__ node: binary_search_tree.Node / AVLNode / binary_tree.Node
+# - struct-of-arrays: ArrayBinarySearchTree (keys & child indices in typed arrays)
+import random
+import sys
+import tracemalloc
+
+import binary_tree
+from binary_search_tree import ArrayBinarySearchTree, AVLNode, Node
+
+
+class DictNode:
+    "Tree node without __slots__ (how Node used to be stored)"
+
+    def __init__(self, key, left=None, right=None):
+        self.key = key
+        self.left = left
+        self.right = right
+
+
+def linked_nodes(node_class, keys):
+    "Building a chain of linked nodes (memory doesn't depend on the tree shape)"
+    root = None
+    for k in keys:
+        root = node_class(k, right=root)
+    return root
+
+
+def array_tree(keys):
+    "Building an ArrayBinarySearchTree from the keys"
+    tree = ArrayBinarySearchTree()
+    root = None
+    for k in keys:
+        root = tree.insert(root, k)
+    return tree, root
+
+
+def measure(build, keys):
+    "Returns the bytes allocated (and still alive) by build(keys)"
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(keys)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def benchmark(n):
+    "Printing bytes per node of every layout for n integer keys"
+    keys = list(range(1_000, 1_000 + n))  # ints outside of the small int cache
+    random.shuffle(keys)
+    layouts = {
+        "dict node": lambda ks: linked_nodes(DictNode, ks),
+        "__slots__ Node (BST)": lambda ks: linked_nodes(Node, ks),
+        "__slots__ AVLNode": lambda ks: linked_nodes(AVLNode, ks),
+        "__slots__ Node (BinaryTree)": lambda ks: linked_nodes(binary_tree.Node, ks),
+        "struct-of-arrays": array_tree,
+    }
+    print(f"n = {n} (key int objects already exist, so only the layout is counted)")
+    for name, build in layouts.items():
+        size = measure(build, keys)
+        print(f"{name:<28} {size / n:>8.1f} bytes/node")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
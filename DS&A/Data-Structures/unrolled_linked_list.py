@@ -0,0 +1,220 @@
+# Linked List (Unrolled)
+# Each node holds a small array of up to `capacity` consecutive values instead
+# of a single one, so there are capacity times fewer nodes (and pointers) and a
+# full scan reads whole arrays one after another instead of chasing one pointer
+# per value. Nodes are kept at least half full, except at the end of the list.
+from itertools import chain, islice
+
+
+class Node:
+    "Nodes hold a list of consecutive values and point to the next node"
+
+    __slots__ = ("items", "next")
+
+    def __init__(self, items=None):
+        "creating a node with the given values which currently points to nowhere"
+        self.items = items if items is not None else []
+        self.next = None
+
+
+class UnrolledLinkedList:
+    """Unrolled linked list has the same operations as the other linked lists,
+    but positions are indexes (a value isn't a node of its own): in_after(i, x)
+    inserts x after the i-th value. Access by index skips whole nodes: O(n/capacity)"""
+
+    def __init__(self, capacity=64, iterable=()):
+        "starting our linked list with a head and a tail, and the size of each node"
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self.extend(iterable)
+
+    def __len__(self):
+        return self.size
+
+    def nodes(self):
+        "Lazily yielding the value lists of the nodes"
+        t = self.head
+        while t is not None:
+            yield t.items
+            t = t.next
+
+    def __iter__(self):
+        # the values of each node are iterated in C; only nodes are visited in Python
+        return chain.from_iterable(self.nodes())
+
+    def display(self):
+        "Displaying all of the values in our linked list"
+        for data in self:
+            print(data, end=" -> ")
+        print("Null")
+
+    def _locate(self, i):
+        "Returns the node of the i-th value and the value's index in that node"
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError("linked list index out of range")
+        if i >= self.size - len(self.tail.items):
+            return self.tail, i - (self.size - len(self.tail.items))
+        t = self.head
+        while i >= len(t.items):
+            i -= len(t.items)
+            t = t.next
+        return t, i
+
+    def __getitem__(self, i):
+        t, j = self._locate(i)
+        return t.items[j]
+
+    def __setitem__(self, i, data):
+        t, j = self._locate(i)
+        t.items[j] = data
+
+    def index(self, data):
+        "Returns the index of the (first) value in the list, None if it doesn't exist"
+        i = 0
+        t = self.head
+        while t is not None:
+            if data in t.items:
+                return i + t.items.index(data)
+            i += len(t.items)
+            t = t.next
+        return None
+
+    def _append_node(self, items):
+        n = Node(items)
+        if self.tail is None:
+            self.head = n
+        else:
+            self.tail.next = n
+        self.tail = n
+
+    def _insert(self, t, j, data):
+        "Inserting the value at index j of node t, splitting t in two when it overflows"
+        t.items.insert(j, data)
+        self.size += 1
+        if len(t.items) > self.capacity:
+            half = len(t.items) // 2
+            n = Node(t.items[half:])
+            del t.items[half:]
+            n.next = t.next
+            t.next = n
+            if self.tail is t:
+                self.tail = n
+
+    def in_start(self, new_data):
+        "Adding a value to the starting point of our linked list"
+        if self.head is None:
+            self._append_node([new_data])
+            self.size += 1
+        else:
+            self._insert(self.head, 0, new_data)
+
+    def in_end(self, new_data):
+        "Adding a value to the end of our linked list (a new node if the tail is full)"
+        if self.tail is None or len(self.tail.items) == self.capacity:
+            self._append_node([new_data])
+        else:
+            self.tail.items.append(new_data)
+        self.size += 1
+
+    def extend(self, iterable):
+        "Adding all values of the iterable to the end, filling up whole nodes"
+        it = iter(iterable)
+        if self.tail is not None:
+            room = self.capacity - len(self.tail.items)
+            before = len(self.tail.items)
+            self.tail.items.extend(islice(it, room))
+            self.size += len(self.tail.items) - before
+        while True:
+            items = list(islice(it, self.capacity))
+            if not items:
+                return
+            self._append_node(items)
+            self.size += len(items)
+
+    def in_after(self, i, new_data):
+        "Adding a value after the i-th value of our linked list"
+        try:
+            t, j = self._locate(i)
+        except IndexError:
+            print("This index doesn't exist in your linked list")
+            return
+        self._insert(t, j + 1, new_data)
+
+    def remove_node(self, d):
+        """Removing the (first) desired value from the linked list; an under-full
+        node borrows values from its next node or is merged with it.
+        Returns False if the value doesn't exist"""
+        p = None
+        t = self.head
+        while t is not None and d not in t.items:
+            p = t
+            t = t.next
+        if t is None:
+            return False
+        t.items.remove(d)
+        self.size -= 1
+        n = t.next
+        if not t.items:
+            # any node can become empty (the last one, or one holding a single
+            # value when capacity // 2 == 1): it's unlinked
+            if p is None:
+                self.head = n
+            else:
+                p.next = n
+            if self.tail is t:
+                self.tail = p
+        elif n is not None and len(t.items) < self.capacity // 2:
+            if len(t.items) + len(n.items) <= self.capacity:
+                t.items.extend(n.items)
+                t.next = n.next
+                if self.tail is n:
+                    self.tail = t
+            else:
+                k = (len(n.items) - len(t.items)) // 2
+                t.items.extend(n.items[:k])
+                del n.items[:k]
+        return True
+
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    from singly_linked_list import SinglyLinkedList
+
+    l = UnrolledLinkedList(capacity=4)
+    l.extend([3, 4, 5])
+    l.in_start(2)
+    l.in_end(7)
+    l.in_after(3, 6)
+    l.in_after(2, 4.5)
+    l.display()
+    # 2 -> 3 -> 4 -> 4.5 -> 5 -> 6 -> 7 -> Null
+    l.remove_node(4.5)
+    l.display()
+    # 2 -> 3 -> 4 -> 5 -> 6 -> 7 -> Null
+    print(len(l), l[0], l[-1], l.index(5))  # 6 2 7 3
+
+    # memory per value and full scan time vs one node per value
+    n = 1_000_000
+    values = list(range(n))
+    lists = [
+        ("SinglyLinkedList", SinglyLinkedList),
+        ("UnrolledLinkedList", UnrolledLinkedList),
+    ]
+    for name, make in lists:
+        tracemalloc.start()
+        l = make()
+        l.extend(values)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        t = time.perf_counter()
+        total = sum(l)
+        scan = time.perf_counter() - t
+        print(f"{name:<19} {memory / n:>6.1f} bytes/value  scan {scan:.3f}s")